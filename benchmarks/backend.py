@@ -0,0 +1,69 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark of the YAML backends.
+
+This benchmark generates a large tree of catalogs and measures the
+time needed to load it with every available YAML backend.  Run it
+from the repository directory:
+    python -m benchmarks.backend
+
+"""
+
+from __future__ import print_function
+import shutil
+import tempfile
+import time
+
+from benchmarks.generator import generate
+from ytranslate.backend import BACKENDS
+from ytranslate.fsloader import FSLoader
+
+def main(locales=4, files=50, messages=100, repeat=3):
+    """Run the benchmark."""
+    root_dir = tempfile.mkdtemp()
+    try:
+        generate(root_dir, locales=locales, files=files,
+                messages=messages, plural=3)
+        print("{} locales, {} files per locale, {} messages per file".format(
+                locales, files, messages))
+        for name, backend in sorted(BACKENDS.items()):
+            timings = []
+            for i in range(repeat):
+                begin = time.time()
+                loader = FSLoader(root_dir, backend=backend)
+                loader.load()
+                timings.append(time.time() - begin)
+
+            print("  {:<8} {:.3f}s (best of {})".format(name,
+                    min(timings), repeat))
+    finally:
+        shutil.rmtree(root_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the generator of synthetic catalogs.
+
+The 'generate' function creates a tree of catalog files, used
+by the benchmarks.  The number of locales, files, namespaces and
+messages can vary, so that different catalog shapes can be measured.
+
+"""
+
+import os
+import os.path
+import random
+
+WORDS = ("window", "title", "error", "connection", "user", "message",
+        "button", "quit", "login", "menu", "file", "edit", "view",
+        "settings", "account", "password", "search", "result")
+
+def generate(root_dir, locales=2, files=10, depth=2, messages=50,
+        plural=0, placeholders=True, seed=0):
+    """Generate a tree of catalog files.
+
+    Parameters:
+        root_dir: the directory in which to create the catalogs.
+        locales: the number of locales (parent catalogs).
+        files: the number of catalog files per locale.
+        depth: the number of directories between the locale and a file.
+        messages: the number of messages per file.
+        plural: the size of plural groups (0 for no plural group).
+        placeholders: should some messages contain placeholders?
+        seed: the random seed, to generate the same tree every time.
+
+    Every locale has the same structure and addresses.  Every fifth
+    message is a plural group if 'plural' is set.
+
+    Return the list of addresses of the first locale.
+
+    """
+    rand = random.Random(seed)
+    addresses = []
+    for locale in range(locales):
+        name = "l{:02}".format(locale)
+        for number in range(files):
+            directories = ["ns{}".format((number + level) % 5) for level in
+                    range(depth)]
+            directory = os.path.join(root_dir, name, *directories)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+            filename = "file{}".format(number)
+            prefix = ".".join(directories + [filename])
+            groups = {}
+            for index in range(messages):
+                key = "{}{}".format(WORDS[index % len(WORDS)], index)
+                group = "group{}".format(index % 4)
+                text = " ".join(rand.choice(WORDS) for i in range(6))
+                if placeholders and index % 3 == 0:
+                    text += " {user}"
+
+                lines = groups.setdefault(group, [])
+                if plural and index % 5 == 0:
+                    lines.append("    {}:".format(key))
+                    for count in range(plural):
+                        number_key = str(count)
+                        if count == plural - 1:
+                            number_key += "+"
+
+                        lines.append("        '{}': {} {{count}}".format(
+                                number_key, text))
+                else:
+                    lines.append("    {}: {}".format(key, text))
+
+                if locale == 0:
+                    addresses.append("{}.{}.{}".format(prefix, group, key))
+
+            path = os.path.join(directory, filename + ".yml")
+            with open(path, "w") as file:
+                for group, lines in sorted(groups.items()):
+                    file.write(group + ":\n")
+                    for line in lines:
+                        file.write(line + "\n")
+
+    return addresses
@@ -0,0 +1,83 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark of the namespace index.
+
+This benchmark generates a large catalog and writes the nested
+dictionary of every namespace, as 'FSLoader.save_catalog' does,
+with the former implementation of 'Catalog.write_dictionary'
+(sorting and filtering every address for every namespace) and with
+the index of addresses.  Run it from the repository directory:
+    python -m benchmarks.index
+
+"""
+
+from __future__ import print_function
+import shutil
+import tempfile
+import time
+
+from benchmarks.generator import generate
+from ytranslate.fsloader import FSLoader
+
+def scan_keys(catalog, root=""):
+    """Return the sorted addresses of a namespace by scanning them all."""
+    keys = sorted(catalog.messages.keys())
+    if root:
+        keys = [key for key in keys if key.startswith(root + ".")]
+
+    return keys
+
+def main(files=500, messages=50):
+    """Run the benchmark."""
+    root_dir = tempfile.mkdtemp()
+    try:
+        generate(root_dir, locales=1, files=files, messages=messages)
+        loader = FSLoader(root_dir)
+        loader.load()
+    finally:
+        shutil.rmtree(root_dir)
+
+    catalog = loader.catalogs["l00"]
+    namespaces = sorted(loader.namespaces)
+    print("{} namespaces, {} messages".format(len(namespaces),
+            len(catalog.messages)))
+
+    begin = time.time()
+    scanned = [scan_keys(catalog, namespace) for namespace in namespaces]
+    print("  scan  {:.3f}s".format(time.time() - begin))
+
+    begin = time.time()
+    catalog.index = None
+    indexed = [catalog.keys(namespace) for namespace in namespaces]
+    print("  index {:.3f}s (including the index creation)".format(
+            time.time() - begin))
+    assert scanned == indexed
+
+if __name__ == "__main__":
+    main()
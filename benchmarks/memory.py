@@ -0,0 +1,84 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark of the memory used by catalogs.
+
+This benchmark generates several locales and measures, with the
+'tracemalloc' module, the memory used by a loader in the default
+mode and in the compact mode.  Run it from the repository directory:
+    python -m benchmarks.memory
+
+"""
+
+from __future__ import print_function
+import gc
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generator import generate
+from ytranslate.fsloader import FSLoader
+
+def measure(root_dir, **kwargs):
+    """Load the catalogs, return the loader, memory and time."""
+    gc.collect()
+    tracemalloc.start()
+    begin = time.time()
+    loader = FSLoader(root_dir, **kwargs)
+    loader.load()
+    duration = time.time() - begin
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return loader, memory, duration
+
+def main(locales=10, files=50, messages=100):
+    """Run the benchmark."""
+    root_dir = tempfile.mkdtemp()
+    try:
+        addresses = generate(root_dir, locales=locales, files=files,
+                messages=messages, plural=3)
+        print("{} locales, {} messages per locale".format(locales,
+                len(addresses)))
+        for name, kwargs in (("default", {}), ("compact", {"compact": True})):
+            loader, memory, duration = measure(root_dir, **kwargs)
+            catalog = loader.catalogs["l00"]
+            begin = time.time()
+            for address in addresses:
+                catalog.messages.get(address)
+            lookup = time.time() - begin
+            print("  {:<8} {:>8.1f} KiB, loaded in {:.3f}s, {} lookups " \
+                    "in {:.3f}s".format(name, memory / 1024.0, duration,
+                    len(addresses), lookup))
+            del loader, catalog
+    finally:
+        shutil.rmtree(root_dir)
+
+if __name__ == "__main__":
+    main()
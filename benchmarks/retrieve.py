@@ -0,0 +1,125 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark of the retrieval of messages.
+
+This benchmark compares 'Catalog.retrieve' with the same method
+formatting every message with 'str.format' (the former behavior),
+for messages without placeholders, with one and three placeholders
+and with a count indicator.  Run it from the repository directory:
+    python -m benchmarks.retrieve
+
+"""
+
+from __future__ import print_function
+import timeit
+
+from ytranslate import stats
+from ytranslate.catalog import Catalog
+
+MESSAGES = {
+    "static": "Welcome to the application",
+    "one": "Hello, {name}!",
+    "three": "{name} sent {subject} to {recipient}",
+    "emails": {
+        "0": "You have no email",
+        "1": "You have one email",
+        "2+": "You have {count} emails",
+    },
+}
+
+CALLS = [
+    ("static", (), {}),
+    ("one", (), {"name": "Jean"}),
+    ("three", (), {"name": "Jean", "subject": "news",
+            "recipient": "Marie"}),
+    ("emails", (1, ), {}),
+    ("emails", (5, ), {}),
+]
+
+class FormatCatalog(Catalog):
+
+    """Catalog formatting every message, without checking for braces."""
+
+    def retrieve(self, address, count=None, **kwargs):
+        """Retrieve and always format the message.
+
+        This is 'Catalog.retrieve' without the cache and the check for
+        braces.
+
+        """
+        if stats.profile is not None:
+            return self.retrieve_profiled(address, count, kwargs)
+
+        messages = self.messages
+        cache = self.cache
+        if cache is not None:
+            raise ValueError("the cache isn't benchmarked")
+
+        message = messages.get(address)
+        if message is None and self.pending:
+            self.load_pending(address)
+            messages = self.messages
+            message = messages.get(address)
+
+        if count is None and message is None:
+            raise ValueError("address {} cannot be found in this " \
+                    "catalog".format(repr(address)))
+
+        if count is not None:
+            message = self.retrieve_count(address, count, **kwargs)
+
+        return message.format(count=count, **kwargs)
+
+def main(number=100000, repeat=25):
+    """Run the benchmark."""
+    baseline = FormatCatalog("baseline")
+    baseline.read_dictionary(MESSAGES)
+    catalog = Catalog("checked")
+    catalog.read_dictionary(MESSAGES)
+    print("{:<10} {:>10} {:>10} {:>7}".format("message", "format",
+            "checked", "gain"))
+    for address, args, kwargs in CALLS:
+        assert baseline.retrieve(address, *args, **kwargs) == \
+                catalog.retrieve(address, *args, **kwargs)
+
+        # The two versions are measured alternately, the best run wins
+        timings = {baseline: [], catalog: []}
+        for i in range(repeat):
+            for tested in (baseline, catalog):
+                call = lambda: tested.retrieve(address, *args, **kwargs)
+                timings[tested].append(timeit.timeit(call, number=number))
+
+        before = min(timings[baseline]) / number * 1e9
+        after = min(timings[catalog]) / number * 1e9
+        name = address if not args else "{}({})".format(address, args[0])
+        print("{:<10} {:>7.0f} ns {:>7.0f} ns {:>6.0%}".format(name,
+                before, after, (before - after) / before))
+
+if __name__ == "__main__":
+    main()
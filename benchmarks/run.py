@@ -0,0 +1,199 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark suite of the main operations.
+
+This benchmark generates a tree of catalogs (see 'generator.py') and
+measures the time needed to load it, to retrieve messages (with and
+without placeholders, with a count indicator), to write a catalog
+as YAML, to save a catalog and to update a catalog from a model.
+The results are written as JSON, so that runs can be compared across
+versions.  Run it from the repository directory:
+    python -m benchmarks.run --files 50 --plural 3 -o results.json
+
+"""
+
+from __future__ import print_function
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+from timeit import default_timer as timer
+
+import yaml
+
+from benchmarks.generator import generate
+from ytranslate.backend import get_backend
+from ytranslate.fsloader import FSLoader
+
+def measure(function, repeat=5, operations=1, setup=None):
+    """Call a function several times and return its timings.
+
+    If 'setup' is specified, it is called before each call (and
+    isn't measured).  Its result is given to the function.
+
+    """
+    timings = []
+    for i in range(repeat):
+        argument = setup() if setup else None
+        begin = timer()
+        function(argument)
+        timings.append(timer() - begin)
+
+    best = min(timings)
+    return {
+        "best": best,
+        "mean": sum(timings) / len(timings),
+        "repeat": repeat,
+        "operations": operations,
+        "per_operation": best / operations,
+    }
+
+def run(root_dir, repeat=5, backend=None):
+    """Run the benchmarks on a generated tree, return the results."""
+    results = {}
+
+    def load(argument):
+        FSLoader(root_dir, backend=backend).load()
+
+    results["load"] = measure(load, repeat)
+
+    loader = FSLoader(root_dir, backend=backend)
+    loader.load()
+    catalog = loader.catalogs["l00"]
+    plain = []
+    formatted = []
+    plurals = []
+    for address, message in sorted(catalog.messages.items()):
+        if isinstance(message, dict):
+            plurals.append(address)
+        elif "{" in message:
+            formatted.append(address)
+        else:
+            plain.append(address)
+
+    def retrieve(addresses, **kwargs):
+        def function(argument):
+            for address in addresses:
+                catalog.retrieve(address, **kwargs)
+        return function
+
+    results["retrieve"] = measure(retrieve(plain), repeat, len(plain))
+    results["retrieve_placeholders"] = measure(retrieve(formatted,
+            user="Jean"), repeat, len(formatted))
+    if plurals:
+        def retrieve_count(argument):
+            for address in plurals:
+                for count in (1, 2, 5):
+                    catalog.retrieve(address, count, user="Jean")
+
+        results["retrieve_count"] = measure(retrieve_count, repeat,
+                len(plurals) * 3)
+
+    results["write_YAML"] = measure(lambda argument: catalog.write_YAML(),
+            repeat)
+    results["save_catalog"] = measure(lambda argument: loader.save_catalog(
+            catalog), repeat, len(loader.namespaces))
+
+    def remove_half():
+        # Every other message is missing from the updated catalog
+        updater = FSLoader(root_dir, backend=backend)
+        updater.load()
+        updated = updater.catalogs["l01"]
+        for address in sorted(updated.messages.keys())[::2]:
+            del updated.messages[address]
+        return updater
+
+    results["update_catalog"] = measure(lambda updater:
+            updater.update_catalog("l01", "l00"), repeat, setup=remove_half)
+    return results
+
+def main(argv=None):
+    """Parse the arguments, run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description="benchmark ytranslate")
+    parser.add_argument("--locales", type=int, default=2,
+            help="the number of locales")
+    parser.add_argument("--files", type=int, default=20,
+            help="the number of catalog files per locale")
+    parser.add_argument("--depth", type=int, default=2,
+            help="the number of directories between a locale and a file")
+    parser.add_argument("--messages", type=int, default=50,
+            help="the number of messages per file")
+    parser.add_argument("--plural", type=int, default=3,
+            help="the size of plural groups (0 for no plural group)")
+    parser.add_argument("--repeat", type=int, default=5,
+            help="the number of times each operation is measured")
+    parser.add_argument("--backend", default=None,
+            help="the YAML backend to use ('python' or 'c')")
+    parser.add_argument("-o", "--output", default=None,
+            help="the JSON file in which to write the results")
+    args = parser.parse_args(argv)
+    if args.locales < 2:
+        parser.error("at least two locales are needed to update a catalog")
+
+    backend = get_backend(args.backend)
+    parameters = {
+        "locales": args.locales,
+        "files": args.files,
+        "depth": args.depth,
+        "messages": args.messages,
+        "plural": args.plural,
+        "repeat": args.repeat,
+        "backend": backend.name,
+    }
+
+    root_dir = tempfile.mkdtemp()
+    try:
+        generate(root_dir, locales=args.locales, files=args.files,
+                depth=args.depth, messages=args.messages,
+                plural=args.plural)
+        results = run(root_dir, args.repeat, backend)
+    finally:
+        shutil.rmtree(root_dir)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "yaml": yaml.__version__,
+        },
+        "parameters": parameters,
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=4, sort_keys=True)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ through creating and updating losely-defined YAML catalogs.
 setup(
     name = "ytranslate",
     version = "0.3",
-    packages = find_packages(),
+    packages = find_packages(exclude=["benchmarks"]),
     install_requires = ['pyyaml>=3'],
     description = DESCRIPTION,
     author = 'Vincent Le Goff',
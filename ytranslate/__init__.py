@@ -1 +1 @@
-﻿from ytranslate.tools import init, select, t
+﻿from ytranslate.tools import bind, init, select, t, t_many, using
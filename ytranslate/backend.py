@@ -0,0 +1,95 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the Backend class, described below.
+
+The available backends are stored in the 'BACKENDS' dictionary.
+The 'python' backend is always available.  The 'c' backend is
+only available if PyYAML has been built with libyaml, and is
+then used by default.
+
+"""
+
+import yaml
+
+class Backend(object):
+
+    """A YAML backend, used to parse and dump YAML content.
+
+    A backend is defined by a YAML loader class and a YAML dumper
+    class.  Only safe loaders and dumpers should be used, since
+    catalogs only contain dictionaries and strings.
+
+    """
+
+    def __init__(self, name, loader, dumper):
+        self.name = name
+        self.loader = loader
+        self.dumper = dumper
+
+    def __repr__(self):
+        return "<ytranslate.Backend {}>".format(repr(self.name))
+
+    def load(self, content):
+        """Parse the YAML content and return the data."""
+        return yaml.load(content, Loader=self.loader)
+
+    def dump(self, data, stream=None, **kwargs):
+        """Dump the data as YAML.
+
+        If no stream is specified, return the YAML content.
+
+        """
+        return yaml.dump(data, stream, Dumper=self.dumper, **kwargs)
+
+BACKENDS = {
+    "python": Backend("python", yaml.SafeLoader, yaml.SafeDumper),
+}
+
+if hasattr(yaml, "CSafeLoader"):
+    BACKENDS["c"] = Backend("c", yaml.CSafeLoader, yaml.CSafeDumper)
+
+DEFAULT_BACKEND = BACKENDS.get("c", BACKENDS["python"])
+
+def get_backend(backend=None):
+    """Return the backend of this name.
+
+    If the backend is None, return the default backend.  If the
+    backend is already a Backend object, return it.
+
+    """
+    if backend is None:
+        return DEFAULT_BACKEND
+    elif isinstance(backend, Backend):
+        return backend
+
+    if backend not in BACKENDS:
+        raise ValueError("unknown YAML backend {}, available backends " \
+                "are {}".format(repr(backend), ", ".join(sorted(BACKENDS))))
+
+    return BACKENDS[backend]
@@ -28,8 +28,19 @@
 
 """Module containing the Catalog class, described below."""
 
+from threading import RLock
+from timeit import default_timer as timer
+
 import yaml
 
+from ytranslate import stats
+from ytranslate.backend import get_backend
+from ytranslate.index import KeyIndex
+from ytranslate.lru import LRUCache
+from ytranslate.namespace import Namespace
+from ytranslate.plural import Plural
+from ytranslate.stream import StreamReader, StreamWriter
+
 try:
     unicode
 except NameError:
@@ -85,17 +96,42 @@ class Catalog:
     in folders and sub-folers, which are just new namespaces in
     the hierarchy.
 
+    The YAML backend used to read and write YAML content can be
+    specified (see 'ytranslate.backend').  By default, the fastest
+    available backend is used.
+
     """
 
-    def __init__(self, name):
+    def __init__(self, name, backend=None):
         self.name = name
+        self.backend = get_backend(backend)
         self.messages = {}
+        self.plurals = {}
+        self.pending = {}
+        self.dirty = set()
+        self.index = None
+        self.origins = {}
+        self.cache = None
+        self.pending_lock = RLock()
 
     def __repr__(self):
         return "<ytranslate.Catalog {}>".format(repr(self.name))
 
     def read_dictionary(self, dictionary, parent=""):
         """Read a namespace defined in a dictionary."""
+        self.clear_cache()
+        added = [] if self.indexed() else None
+        self.read_namespace(dictionary, parent, added)
+        if added:
+            self.index.update(added)
+
+    def read_namespace(self, dictionary, parent, added=None):
+        """Read the messages of a namespace.
+
+        The 'read_dictionary' method calls 'read_namespace'.  If
+        a list is specified, the new addresses are added in it.
+
+        """
         for name, entry in dictionary.items():
             name = str(name)
             if parent:
@@ -107,12 +143,47 @@ class Catalog:
                     for key, value in entry.items():
                         copied[str(key)] = unicode(value)
 
+                    if added is not None and name not in self.messages:
+                        added.append(name)
                     self.messages[name] = copied
+                    self.plurals[name] = Plural(name, copied)
                 else:
-                    self.read_dictionary(entry, parent=name)
+                    self.read_namespace(entry, name, added)
             else:
+                if added is not None and name not in self.messages:
+                    added.append(name)
                 self.messages[name] = unicode(entry)
 
+    def load_pending(self, address=None):
+        """Load the pending namespaces.
+
+        Loaders can delay the loading of namespaces:  the 'pending'
+        dictionary contains, as keys, the namespaces not loaded yet
+        and, as values, a callable to load each of them.  If an
+        address is specified, only load the namespaces containing
+        it.  Otherwise, load all pending namespaces.
+
+        Return whether some namespaces have been loaded.
+
+        """
+        loaded = False
+        with self.pending_lock:
+            if address is None:
+                namespaces = list(self.pending.keys())
+            else:
+                names = address.split(".")
+                namespaces = [".".join(names[:i]) for i in range(
+                        len(names))]
+
+            for namespace in namespaces:
+                load = self.pending.get(namespace)
+                if load is not None:
+                    load()
+                    del self.pending[namespace]
+                    loaded = True
+
+        return loaded
+
     def read_YAML(self, content):
         """Fill the catalog using this YAML content.
 
@@ -140,32 +211,219 @@ class Catalog:
         }
 
         """
+        self.read_dictionary(self.parse_YAML(content))
+
+    def read_stream(self, stream):
+        """Fill the catalog by reading a YAML stream.
+
+        The stream (usually an open file) is read chunk by chunk,
+        and the messages are flattened as soon as they are parsed
+        (see 'ytranslate.stream.StreamReader').  The result is the
+        same as with 'read_YAML', but neither the whole content nor
+        the nested dictionary are kept in memory.
+
+        """
+        self.clear_cache()
+        self.index = None
         try:
-            data = yaml.safe_load(content)
-        except yaml.parser.ParserError as err:
+            StreamReader(self, stream).read()
+        except yaml.YAMLError as err:
             # Use a newly-defined expression
             raise ValueError("an error occurred while parsing the " \
                     "YAML content:\n{}".format(str(err)))
 
-        if isinstance(data, dict):
-            self.read_dictionary(data)
-        else:
+    def parse_YAML(self, content):
+        """Parse the YAML content and return the dictionary it describes.
+
+        The 'read_YAML' method parses the content, then reads the
+        dictionary.
+
+        """
+        try:
+            data = self.backend.load(content)
+        except yaml.YAMLError as err:
+            # Use a newly-defined expression
+            raise ValueError("an error occurred while parsing the " \
+                    "YAML content:\n{}".format(str(err)))
+
+        if not isinstance(data, dict):
             raise ValueError("catalog {}, the YAML content doesn't " \
                     "describe a dictionary".format(self.name))
 
+        return data
+
     def copy_from(self, catalog, namespace=""):
         """Copy the messages of the catalog provided as a parameter.
 
         The 'namespace' parameter can create sub-namespaces for
-        a whole catalog.
+        a whole catalog.  The compiled groups of messages (see
+        'compile_plurals') are copied as well.
 
         """
+        self.clear_cache()
+        added = [] if self.indexed() else None
         for name, message in catalog.messages.items():
             if namespace:
                 name = namespace + "." + name
 
+            if added is not None and name not in self.messages:
+                added.append(name)
             self.messages[name] = message
 
+        if added:
+            self.index.update(added)
+
+        for name, plural in catalog.plurals.items():
+            if plural.messages is catalog.messages.get(name):
+                if namespace:
+                    name = namespace + "." + name
+
+                self.plurals[name] = plural.copy(name)
+
+    def compile_plurals(self):
+        """Compile the groups of messages which aren't compiled yet.
+
+        'read_dictionary' compiles the groups of messages it reads
+        (see the 'Plural' class).  Messages read otherwise (from
+        a stream or a compiled file, for instance) are compiled when
+        first retrieved, or by this method.
+
+        """
+        plurals = self.plurals
+        for address, message in self.messages.items():
+            if isinstance(message, dict):
+                plural = plurals.get(address)
+                if plural is None or plural.messages is not message:
+                    plurals[address] = Plural(address, message)
+
+    def set_message(self, address, message):
+        """Add or replace a message.
+
+        The address is marked as modified (see the 'dirty' set),
+        which allows loaders to only save the modified namespaces.
+
+        """
+        if address not in self.messages and self.indexed():
+            self.index.update([address])
+
+        self.messages[address] = message
+        self.dirty.add(address)
+        self.clear_cache()
+
+    def remove_message(self, address):
+        """Remove a message.
+
+        The address is marked as modified (see 'set_message') and
+        the index of addresses is cleared.  A ValueError is raised
+        if the message cannot be found.
+
+        """
+        if address not in self.messages:
+            raise ValueError("address {} cannot be found in this " \
+                    "catalog".format(repr(address)))
+
+        del self.messages[address]
+        self.dirty.add(address)
+        self.clear_index()
+        self.clear_cache()
+
+    def enable_cache(self, size=1024):
+        """Cache the rendered messages.
+
+        The messages retrieved with the same address, count indicator
+        and placeholders are cached, up to 'size' messages, the least
+        recently used being discarded.  The cache is cleared when
+        the messages are modified or replaced.  Its 'hits' and
+        'misses' attributes can help choose its size.
+
+        Placeholders must be hashable for the message to be cached.
+
+        """
+        self.cache = LRUCache(size)
+
+    def disable_cache(self):
+        """Stop caching the rendered messages."""
+        self.cache = None
+
+    def clear_cache(self):
+        """Clear the cache of rendered messages, if any."""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def origin(self, address):
+        """Return the name of the catalog defining this message.
+
+        Catalogs built from several catalogs (see 'FSLoader.views')
+        remember which catalog each message comes from.  If the
+        message cannot be found, return None.
+
+        """
+        if address not in self.messages:
+            return None
+
+        return self.origins.get(address, self.name)
+
+    def indexed(self):
+        """Return whether the index of addresses is up to date.
+
+        Methods adding messages ('read_dictionary', 'copy_from' and
+        'set_message') update the index if it's up to date, rather
+        than building it again, and 'remove_message' clears it.
+        Addresses added directly in 'messages' are noticed, since
+        the index doesn't have the same size anymore, but removed
+        addresses aren't:  'clear_index' must be called after
+        removing messages from 'messages' directly.
+
+        """
+        index = self.index
+        return index is not None and index.messages is self.messages and \
+                len(index) == len(self.messages)
+
+    def get_index(self):
+        """Return the index of addresses, building it if needed.
+
+        The index is built again if it has been cleared, if the
+        messages have been replaced, or if addresses have been added
+        without updating the index (see 'indexed').
+
+        """
+        if not self.indexed():
+            self.index = KeyIndex(self.messages)
+
+        return self.index
+
+    def clear_index(self):
+        """Clear the index of addresses, which will be built again.
+
+        This method must be called after removing messages from
+        'messages' directly (see 'indexed').
+
+        """
+        self.index = None
+
+    def keys(self, root=""):
+        """Return the sorted addresses in the namespace 'root'."""
+        return self.get_index().prefix(root)
+
+    def items(self, root=""):
+        """Return the sorted addresses and messages in the namespace 'root'.
+
+        For instance, to send the messages of a namespace as JSON:
+            json.dumps(dict(catalog.items("ui.dashboard")))
+
+        """
+        messages = self.messages
+        return [(address, messages[address]) for address in
+                self.keys(root)]
+
+    def count(self, root=""):
+        """Return the number of messages in the namespace 'root'."""
+        return self.get_index().count(root)
+
+    def list_namespaces(self, root=""):
+        """Return the sorted names of the sub-namespaces of 'root'."""
+        return self.get_index().children(root)
+
     def write_dictionary(self, root=""):
         """Write the nested dictionary.
 
@@ -181,10 +439,7 @@ class Catalog:
         a root.
 
         """
-        keys = sorted(self.messages.keys())
-        if root:
-            keys = [key for key in keys if key.startswith(root + ".")]
-
+        keys = self.keys(root)
         nested = {}
         for key in keys:
             value = self.messages[key]
@@ -208,9 +463,20 @@ class Catalog:
     def write_YAML(self, root=""):
         """Return the nested content as YAML."""
         nested = self.write_dictionary(root)
-        return yaml.safe_dump(nested, indent=4, width=79,
+        return self.backend.dump(nested, indent=4, width=79,
                 default_flow_style=False)
 
+    def write_stream(self, stream, root=""):
+        """Write the nested content as YAML in a stream.
+
+        The output is the same as with 'write_YAML', but the YAML
+        content is written to the stream (usually an open file) while
+        it's emitted, without building the nested dictionary (see
+        'ytranslate.stream.StreamWriter').
+
+        """
+        StreamWriter(self, stream, root).write()
+
     def retrieve(self, address, count=None, **kwargs):
         """Retrieve the message using the specified address.
 
@@ -234,8 +500,46 @@ class Catalog:
         in Russian, for instance).  The full syntax is described
         in the 'retrieve_count' method.
 
+        Messages without braces are returned as is, without being
+        formatted.
+
+        If the cache is enabled (see 'enable_cache'), the rendered
+        message is cached.  If a profile is enabled (see
+        'ytranslate.stats'), the message is recorded in it instead.
+
         """
-        message = self.messages.get(address)
+        if stats.profile is not None:
+            return self.retrieve_profiled(address, count, kwargs)
+
+        # The messages can be replaced by another thread (see
+        # 'FSLoader.reload'), so they're read once
+        messages = self.messages
+        cache = self.cache
+        if cache is not None:
+            if cache.messages is not messages:
+                cache.clear()
+                cache.messages = messages
+
+            # Equal values of different types (1, 1.0 and True) may
+            # not be rendered the same way
+            try:
+                key = (address, count, type(count), frozenset((name,
+                        value, type(value)) for name, value in \
+                        kwargs.items()))
+                rendered = cache.get(key)
+            except TypeError:
+                # The placeholders cannot be hashed
+                cache = None
+            else:
+                if rendered is not None:
+                    return rendered
+
+        message = messages.get(address)
+        if message is None and self.pending:
+            self.load_pending(address)
+            messages = self.messages
+            message = messages.get(address)
+
         if count is None and message is None:
             raise ValueError("address {} cannot be found in this " \
                     "catalog".format(repr(address)))
@@ -243,7 +547,96 @@ class Catalog:
         if count is not None:
             message = self.retrieve_count(address, count, **kwargs)
 
-        return message.format(count=count, **kwargs)
+        if "{" in message or "}" in message:
+            rendered = message.format(count=count, **kwargs)
+        else:
+            rendered = message
+
+        if cache is not None and cache.messages is messages:
+            cache.put(key, rendered)
+
+        return rendered
+
+    def retrieve_profiled(self, address, count, kwargs):
+        """Retrieve a message and record it in the current profile.
+
+        The 'retrieve' method calls 'retrieve_profiled' if a profile
+        is enabled.  The time spent to select a message with a count
+        indicator and to format it are recorded separately.  The
+        cache of rendered messages isn't used.
+
+        """
+        record = stats.profile.get(address)
+        record.calls += 1
+        begin = timer()
+        try:
+            message = self.messages.get(address)
+            if message is None and self.pending:
+                self.load_pending(address)
+                message = self.messages.get(address)
+
+            if count is None and message is None:
+                raise ValueError("address {} cannot be found in this " \
+                        "catalog".format(repr(address)))
+
+            if count is not None:
+                selection = timer()
+                message = self.retrieve_count(address, count, **kwargs)
+                record.count_time += timer() - selection
+                branch = self.plurals[address].branch(count)
+                record.branches[branch] = record.branches.get(branch, 0) + 1
+
+            formatting = timer()
+            if "{" in message or "}" in message:
+                rendered = message.format(count=count, **kwargs)
+            else:
+                rendered = message
+
+            record.format_time += timer() - formatting
+        except ValueError:
+            record.misses += 1
+            raise
+        finally:
+            record.time += timer() - begin
+
+        return rendered
+
+    def retrieve_many(self, items, **kwargs):
+        """Retrieve several messages at once.
+
+        The items can be addresses, or tuples containing an address,
+        a count indicator and a dictionary of placeholders (the last
+        two being optional).  The placeholders specified as keyword
+        arguments are used for every message.  For instance:
+            catalog.retrieve_many(["ui.title", ("ui.emails", 3),
+                    ("ui.login.user", None, {"name": "Jean"})])
+
+        Return the list of messages, in the same order.
+
+        """
+        retrieve = self.retrieve
+        messages = []
+        for item in items:
+            if isinstance(item, tuple):
+                count = item[1] if len(item) > 1 else None
+                placeholders = kwargs
+                if len(item) > 2 and item[2]:
+                    placeholders = dict(kwargs)
+                    placeholders.update(item[2])
+
+                messages.append(retrieve(item[0], count, **placeholders))
+            else:
+                messages.append(retrieve(item, **kwargs))
+
+        return messages
+
+    def bind(self, namespace):
+        """Return the namespace bound to this catalog.
+
+        See the 'Namespace' class.
+
+        """
+        return Namespace(namespace, self)
 
     def retrieve_count(self, address, count, **kwargs):
         """Retrieve a message when a 'count' indicator is present.
@@ -266,12 +659,19 @@ class Catalog:
         which means "either that number of more".  For instance,
         '5+' means either 5 or more.  This way, you can configure
         the catalog to different singular and plural rules
-        depending on the language.
+        depending on the language.  If both a number and a number
+        followed by '+' match, the number wins.  Otherwise, the
+        greatest matching number followed by '+' is selected.
+
+        The groups of messages are compiled once in a dispatch table
+        (see the 'Plural' class), usually by 'read_dictionary'.
 
         """
-        equal = lambda a, b: a == b
-        greater = lambda a, b: a >= b
-        messages = self.messages.get(address, {})
+        messages = self.messages.get(address)
+        plural = self.plurals.get(address)
+        if plural is not None and plural.messages is messages:
+            return plural.select(count)
+
         if messages is None:
             raise ValueError("address {} cannot be found in this " \
                     "catalog".format(repr(address)))
@@ -281,26 +681,6 @@ class Catalog:
                     "at this address aren't several values".format(
                     repr(address)))
 
-        message = None
-        for key in reversed(list(messages.keys())):
-            value = messages[key]
-            compare = equal
-            if key.endswith("+"):
-                key = key[:-1]
-                compare = greater
-
-            if not key.isdigit():
-                raise ValueError("message {}: {} isn't a valid " \
-                        "number.".format(repr(address), key))
-
-            key = int(key)
-            if compare(count, key):
-                message = value
-                break
-
-        if message is None:
-            raise ValueError("address {}: no proper message " \
-                    "to be displayed with a count of {}".format(
-                    repr(address), count))
-
-        return message
+        plural = Plural(address, messages)
+        self.plurals[address] = plural
+        return plural.select(count)
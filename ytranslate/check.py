@@ -0,0 +1,368 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the validation of catalog files, described below.
+
+The 'check' function validates every catalog file of a directory
+and returns the list of problems found (see 'Problem'), with their
+file and line numbers.  Each file is checked for:
+
+-   YAML syntax errors, and content which isn't a dictionary.
+-   Keys defined twice in the same dictionary.
+-   Invalid numbers in groups of messages selected by a count
+    indicator, and groups in which some counts cannot be selected
+    (no number followed by the '+' sign).
+-   Messages which aren't strings, and invalid placeholders.
+-   Placeholders which differ from the same message in the model
+    catalog.
+
+Files can be checked in parallel, using an executor of the
+'concurrent.futures' module.
+
+"""
+
+from string import Formatter
+import sys
+
+from yaml import YAMLError
+from yaml.nodes import MappingNode, ScalarNode
+
+from ytranslate.backend import get_backend
+from ytranslate.diff import placeholders
+from ytranslate.fsloader import FSLoader, read_file
+
+try:
+    unicode
+except NameError:
+    unicode = str
+
+_formatter = Formatter()
+
+MERGE_TAG = "tag:yaml.org,2002:merge"
+STR_TAG = "tag:yaml.org,2002:str"
+
+class Problem(object):
+
+    """A problem found in a catalog file.
+
+    The line number starts at 1.  It's None if the problem concerns
+    the whole file.
+
+    """
+
+    __slots__ = ("fullname", "line", "message")
+
+    def __init__(self, fullname, line, message):
+        self.fullname = fullname
+        self.line = line
+        self.message = message
+
+    def __repr__(self):
+        return "<ytranslate.Problem {}>".format(str(self))
+
+    def __str__(self):
+        if self.line is None:
+            return "{}: {}".format(self.fullname, self.message)
+
+        return "{}:{}: {}".format(self.fullname, self.line, self.message)
+
+    def sort_key(self):
+        """Return the key used to sort problems."""
+        return (self.fullname, self.line or 0, self.message)
+
+    def to_dict(self):
+        """Return the problem as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class FileChecker(object):
+
+    """A checker of a catalog file.
+
+    The file is composed (but not constructed), so that every node
+    keeps the position where it's defined.  The 'model' dictionary,
+    if specified, contains the placeholders of each address in the
+    model file.
+
+    """
+
+    def __init__(self, fullname, backend=None, model=None):
+        self.fullname = fullname
+        self.backend = get_backend(backend)
+        self.model = model
+        self.loader = None
+        self.problems = []
+
+    def add(self, node, message):
+        """Add a problem found in a node (or the whole file)."""
+        line = node.start_mark.line + 1 if node is not None else None
+        self.problems.append(Problem(self.fullname, line, message))
+
+    def check(self):
+        """Check the file, return the list of problems."""
+        kwargs = {}
+
+        # If Python 3, enforce the encoding to 'utf-8'
+        if sys.version_info.major == 3:
+            kwargs["encoding"] = "utf-8"
+
+        try:
+            with open(self.fullname, "r", **kwargs) as file:
+                content = file.read()
+        except (IOError, ValueError) as err:
+            self.add(None, "cannot read the file: {}".format(err))
+            return self.problems
+
+        self.loader = None
+        try:
+            self.loader = self.backend.loader(content)
+            node = self.loader.get_single_node()
+            if not isinstance(node, MappingNode):
+                self.add(node, "the YAML content doesn't describe a " \
+                        "dictionary")
+            else:
+                self.check_mapping(node, "")
+        except YAMLError as err:
+            # Reader errors (invalid characters) have a position only
+            mark = getattr(err, "problem_mark", None) or \
+                    getattr(err, "context_mark", None)
+            position = getattr(err, "position", None)
+            line = None
+            if mark is not None:
+                line = mark.line + 1
+            elif position is not None:
+                line = content.count("\n", 0, position) + 1
+
+            problem = getattr(err, "problem", None) or \
+                    getattr(err, "context", None) or str(err)
+            self.problems.append(Problem(self.fullname, line,
+                    "cannot parse the YAML content: {}".format(problem)))
+        finally:
+            if self.loader is not None:
+                self.loader.dispose()
+
+        return self.problems
+
+    def construct(self, node):
+        """Construct the Python object of a node."""
+        if node.tag == STR_TAG and isinstance(node, ScalarNode):
+            # Strings are constructed as is
+            return node.value
+
+        value = self.loader.construct_object(node, deep=True)
+        self.loader.constructed_objects = {}
+        return value
+
+    def entries(self, node):
+        """Return the entries of a mapping, as a list of tuples.
+
+        Each tuple contains the constructed key, the key node and
+        the value node.  Keys defined twice are reported, then the
+        mappings to merge (with the '<<' key) are merged.  If a key
+        isn't hashable, return None.
+
+        """
+        keys = set()
+        entries = []
+        merged = False
+        for key_node, value_node in node.value:
+            if key_node.tag == MERGE_TAG:
+                merged = True
+                continue
+
+            key = self.construct(key_node)
+            try:
+                hash(key)
+            except TypeError:
+                self.add(key_node, "a key should be a string")
+                return None
+
+            if key in keys:
+                self.add(key_node, "the {} key is defined twice".format(
+                        repr(str(key))))
+            keys.add(key)
+            entries.append((key, key_node, value_node))
+
+        if merged:
+            node = MappingNode(node.tag, list(node.value), node.start_mark,
+                    node.end_mark)
+            self.loader.flatten_mapping(node)
+            entries = [(self.construct(key_node), key_node, value_node) for
+                    key_node, value_node in node.value]
+
+        return entries
+
+    def check_mapping(self, node, parent):
+        """Check a namespace defined in a mapping."""
+        entries = self.entries(node)
+        if entries is None:
+            return
+
+        for key, key_node, value_node in entries:
+            name = str(key)
+            address = parent + "." + name if parent else name
+            if isinstance(value_node, MappingNode):
+                self.check_value(address, value_node)
+            elif isinstance(value_node, ScalarNode):
+                message = unicode(self.construct(value_node))
+                self.check_message(address, value_node, message)
+            else:
+                self.add(value_node, "{}: a message should be a " \
+                        "string".format(address))
+
+    def check_value(self, address, node):
+        """Check a mapping, namespace or group of messages."""
+        entries = self.entries(node)
+        if entries is None:
+            return
+
+        numbers = [str(key) for key, key_node, value_node in entries]
+        if all(number.rstrip("+").isdigit() for number in numbers):
+            self.check_group(address, node, numbers, entries)
+        else:
+            self.check_mapping(node, address)
+
+    def check_group(self, address, node, numbers, entries):
+        """Check a group of messages selected by a count indicator."""
+        group = {}
+        for number, (key, number_node, value_node) in zip(numbers, entries):
+            if number.endswith("+") and not number[:-1].isdigit():
+                self.add(number_node, "{}: {} isn't a valid number".format(
+                        address, repr(number)))
+
+            if isinstance(value_node, ScalarNode):
+                message = unicode(self.construct(value_node))
+                self.check_syntax(address, value_node, message)
+                group[number] = message
+            else:
+                self.add(value_node, "{}: a message should be a " \
+                        "string".format(address))
+
+        if not any(number.endswith("+") for number in numbers):
+            self.add(node, "{}: no number is followed by '+', some " \
+                    "counts cannot be selected".format(address))
+
+        self.check_placeholders(address, node, group)
+
+    def check_message(self, address, node, message):
+        """Check a message."""
+        if self.check_syntax(address, node, message):
+            self.check_placeholders(address, node, message)
+
+    def check_syntax(self, address, node, message):
+        """Check the placeholders of a message can be parsed."""
+        try:
+            list(_formatter.parse(message))
+        except ValueError as err:
+            self.add(node, "{}: invalid placeholders: {}".format(address,
+                    err))
+            return False
+
+        return True
+
+    def check_placeholders(self, address, node, message):
+        """Compare the placeholders of a message with the model."""
+        if self.model is None or address not in self.model:
+            return
+
+        expected = self.model[address]
+        names = placeholders(message)
+        if names != expected:
+            differences = []
+            missing = expected - names
+            extra = names - expected
+            if missing:
+                differences.append("missing {}".format(", ".join(
+                        "{" + name + "}" for name in sorted(missing))))
+            if extra:
+                differences.append("extra {}".format(", ".join(
+                        "{" + name + "}" for name in sorted(extra))))
+
+            self.add(node, "{}: the placeholders differ from the model " \
+                    "({})".format(address, ", ".join(differences)))
+
+def read_placeholders(fullname, backend=None):
+    """Return the placeholders of each address of a catalog file.
+
+    If the file cannot be read, return None (its problems are
+    reported when the file itself is checked).
+
+    """
+    try:
+        messages = read_file(fullname, backend)
+    except Exception:
+        return None
+
+    return {address: placeholders(message) for address, message in
+            messages.items()}
+
+def check_file(fullname, backend=None, model=None):
+    """Check a catalog file, return the list of problems.
+
+    This function can be called in another process (see 'check').
+
+    """
+    return FileChecker(fullname, backend, model).check()
+
+def check(root_dir, model="en", executor=None, backend=None):
+    """Check every catalog file of a directory.
+
+    The placeholders of each file are compared with the file of the
+    same namespace in the model catalog.  If an executor is specified,
+    the files are checked in parallel.  Since checking is CPU-bound,
+    a 'ProcessPoolExecutor' should be preferred.
+
+    Return the sorted list of problems.
+
+    """
+    loader = FSLoader(root_dir, backend=backend)
+    fullnames = sorted(loader.find_files())
+    located = [loader.locate(fullname) for fullname in fullnames]
+    backend = loader.backend
+    mapper = map
+    if executor is not None:
+        def mapper(function, *iterables):
+            # Send the files by chunks to limit the communication costs
+            chunksize = max(1, len(iterables[0]) // 64)
+            return executor.map(function, *iterables, chunksize=chunksize)
+
+    # Read the placeholders of the model files first
+    model_files = [fullname for fullname, (parent, namespace) in
+            zip(fullnames, located) if parent == model]
+    models = {}
+    for fullname, result in zip(model_files, mapper(read_placeholders,
+            model_files, [backend] * len(model_files))):
+        models[loader.locate(fullname)[1]] = result
+
+    references = [None if parent == model else models.get(namespace) for
+            parent, namespace in located]
+    problems = []
+    for result in mapper(check_file, fullnames, [backend] * len(fullnames),
+            references):
+        problems.extend(result)
+
+    return sorted(problems, key=Problem.sort_key)
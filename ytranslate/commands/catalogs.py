@@ -53,6 +53,10 @@ class CatalogsCommand(BaseCommand):
                 help="the path to the directory containing the catalogs")
         parser.add_argument("catalog", nargs='?',
                 help="the catalog name to be further examined")
+        parser.add_argument("-p", "--profile", action="store_true",
+                help="display the time spent to load the catalog files")
+        parser.add_argument("-n", "--number", type=int, default=10,
+                help="the number of slowest files to display")
 
     def execute(self, args):
         """Execute the command."""
@@ -66,9 +70,11 @@ class CatalogsCommand(BaseCommand):
                     repr(root_dir)), file=sys.stderr)
             sys.exit(1)
 
-        loader = FSLoader(root_dir)
+        loader = FSLoader(root_dir, profile=args.profile)
         loader.load()
-        if args.catalog:
+        if args.profile:
+            self.display_report(loader.report, args.number)
+        elif args.catalog:
             self.display_catalog(loader, args.catalog)
         elif loader.catalogs:
             self.display_catalogs(loader)
@@ -100,3 +106,19 @@ class CatalogsCommand(BaseCommand):
         for namespace, catalog in sorted(loader.catalogs.items()):
             print("  Catalog {} ({} messages)".format(namespace,
                     len(catalog.messages)))
+
+    def display_report(self, report, number=10):
+        """Display the time spent to load the catalog files."""
+        print("  Slowest files:")
+        for file_report in report.slowest(number):
+            print("    {} ({} messages, {} bytes{}): {:.6f}s".format(
+                    file_report.fullname, file_report.messages,
+                    file_report.bytes, ", compiled" if \
+                    file_report.compiled else "", file_report.total))
+
+        totals = report.totals()
+        print("  Total ({} files, {} compiled, {} messages, {} " \
+                "bytes):".format(totals["files"], totals["compiled"],
+                totals["messages"], totals["bytes"]))
+        for name in ("read", "parse", "flatten", "merge", "total"):
+            print("    {}: {:.6f}s".format(name.capitalize(), totals[name]))
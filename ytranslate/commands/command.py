@@ -31,6 +31,11 @@
 
 from ytranslate.commands.base import BaseCommand
 from ytranslate.commands.catalogs import CatalogsCommand
+from ytranslate.commands.check import CheckCommand
+from ytranslate.commands.compile import CompileCommand
+from ytranslate.commands.diff import DiffCommand
+from ytranslate.commands.search import SearchCommand
+from ytranslate.commands.stats import StatsCommand
 from ytranslate.commands.update import UpdateCommand
 
 class Command(BaseCommand):
@@ -41,3 +46,8 @@ class Command(BaseCommand):
         BaseCommand.__init__(self)
         self.add_subcommand(CatalogsCommand)
         self.add_subcommand(UpdateCommand)
+        self.add_subcommand(CompileCommand)
+        self.add_subcommand(StatsCommand)
+        self.add_subcommand(DiffCommand)
+        self.add_subcommand(CheckCommand)
+        self.add_subcommand(SearchCommand)
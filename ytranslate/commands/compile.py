@@ -0,0 +1,111 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Module containing the CompileCommand class, described below."""
+
+from __future__ import print_function
+import os
+import os.path
+import sys
+
+from ytranslate.commands.base import BaseCommand
+from ytranslate.compiler import compile_file, compiled_path
+from ytranslate.fsloader import FSLoader
+from ytranslate.store import write_store
+
+class CompileCommand(BaseCommand):
+
+    """Commands 'compile'.
+
+    This command compiles the catalog files, so that they can be
+    loaded without parsing YAML.  With the '--store' option, it
+    creates a store file for each catalog instead (see
+    'ytranslate.store').
+
+    """
+
+    name = "compile"
+
+    def __init__(self, parser=None):
+        BaseCommand.__init__(self, parser)
+        parser.add_argument("directory",
+                help="the path to the directory containing the catalogs")
+        parser.add_argument("-o", "--output", nargs='?',
+                help="the directory in which to write compiled files " \
+                "(the catalog directory by default)")
+        parser.add_argument("-s", "--store", action="store_true",
+                help="write a store file for each catalog")
+
+    def execute(self, args):
+        """Execute the command."""
+        root_dir = args.directory
+        if not os.path.exists(root_dir):
+            print("The {} directory doesn't exist".format(repr(root_dir)),
+                    file=sys.stderr)
+            sys.exit(1)
+        elif not os.path.isdir(root_dir):
+            print("The {} path doesn't lead to a directory".format(
+                    repr(root_dir)), file=sys.stderr)
+            sys.exit(1)
+
+        cache_dir = args.output or root_dir
+        loader = FSLoader(root_dir)
+        if args.store:
+            self.write_stores(loader, cache_dir)
+            return
+
+        nb_files = 0
+        nb_messages = 0
+        for fullname in loader.find_files():
+            path = compiled_path(fullname, root_dir, cache_dir)
+            try:
+                nb_messages += compile_file(fullname, path)
+            except ValueError as err:
+                print("Cannot compile {}: {}".format(repr(fullname), err),
+                        file=sys.stderr)
+                sys.exit(1)
+
+            nb_files += 1
+
+        print("Successfully compiled {} files ({} messages) in {}".format(
+                nb_files, nb_messages, repr(cache_dir)))
+
+    def write_stores(self, loader, store_dir):
+        """Write a store file for each catalog."""
+        try:
+            loader.load()
+        except ValueError as err:
+            print(err, file=sys.stderr)
+            sys.exit(1)
+
+        for name, catalog in sorted(loader.catalogs.items()):
+            path = os.path.join(store_dir, name + ".yts")
+            write_store(path, catalog.messages)
+            print("Successfully written the {} store ({} messages)".format(
+                    repr(path), len(catalog.messages)))
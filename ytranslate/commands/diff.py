@@ -0,0 +1,127 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the DiffCommand class, described below."""
+
+from __future__ import print_function
+import json
+import os
+import os.path
+import sys
+
+from ytranslate.commands.base import BaseCommand
+from ytranslate.diff import diff
+from ytranslate.fsloader import FSLoader
+
+class DiffCommand(BaseCommand):
+
+    """Commands 'diff'.
+
+    This command compares catalogs with a model, displaying the
+    missing and obsolete messages, and the messages whose
+    placeholders or groups differ (see 'ytranslate.diff').
+
+    """
+
+    name = "diff"
+
+    def __init__(self, parser=None):
+        BaseCommand.__init__(self, parser)
+        parser.add_argument("directory",
+                help="the path to the directory containing the catalogs")
+        parser.add_argument("catalog", nargs='*',
+                help="the catalog names to be compared with the model")
+        parser.add_argument("-m", "--model", nargs='?',
+                default="en", help="the model catalog to be used")
+        parser.add_argument("-a", "--all", action="store_true",
+                help="compare every catalog except the model")
+        parser.add_argument("-j", "--json", action="store_true",
+                help="display the differences as JSON")
+
+    def execute(self, args):
+        """Execute the command."""
+        root_dir = args.directory
+        if not os.path.exists(root_dir):
+            print("The {} directory doesn't exist".format(repr(root_dir)),
+                    file=sys.stderr)
+            sys.exit(1)
+        elif not os.path.isdir(root_dir):
+            print("The {} path doesn't lead to a directory".format(
+                    repr(root_dir)), file=sys.stderr)
+            sys.exit(1)
+
+        loader = FSLoader(root_dir)
+        loader.load()
+        catalogs = list(args.catalog)
+        if args.all:
+            catalogs += [name for name in sorted(loader.catalogs) if \
+                    name != args.model and name not in catalogs]
+
+        if not catalogs:
+            print("No catalog to compare, specify catalog names or " \
+                    "use --all", file=sys.stderr)
+            sys.exit(1)
+
+        for name in [args.model] + catalogs:
+            if name not in loader.catalogs:
+                print("The catalog {} cannot be found in {}".format(
+                        repr(name), repr(root_dir)), file=sys.stderr)
+                sys.exit(1)
+
+        model = loader.catalogs[args.model]
+        diffs = [diff(loader.catalogs[name], model) for name in catalogs]
+        if args.json:
+            json.dump([result.to_dict() for result in diffs], sys.stdout,
+                    indent=4, sort_keys=True)
+            print()
+        else:
+            for result in diffs:
+                self.display_diff(result)
+
+    def display_diff(self, result):
+        """Display the differences between a catalog and its model."""
+        print("  Catalog {} (model {}): {} missing, {} obsolete, {} " \
+                "placeholder mismatches, {} plural mismatches".format(
+                result.name, result.model, len(result.missing),
+                len(result.obsolete), len(result.placeholders),
+                len(result.plurals)))
+        for address in result.missing:
+            print("    missing {}".format(address))
+
+        for address in result.obsolete:
+            print("    obsolete {}".format(address))
+
+        for address, (missing, extra) in sorted(result.placeholders.items()):
+            print("    placeholders {}: {} missing, {} extra".format(address,
+                    ", ".join(sorted(missing)) or "none",
+                    ", ".join(sorted(extra)) or "none"))
+
+        for address, (model, catalog) in sorted(result.plurals.items()):
+            print("    plural {}: {} in the model, {} in the catalog".format(
+                    address, ", ".join(model) if model else "message",
+                    ", ".join(catalog) if catalog else "message"))
@@ -0,0 +1,113 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the SearchCommand class, described below."""
+
+from __future__ import print_function
+import os
+import os.path
+import sys
+
+from ytranslate.commands.base import BaseCommand
+from ytranslate.fsloader import FSLoader
+from ytranslate.search import SearchIndex, read_index, write_index
+
+class SearchCommand(BaseCommand):
+
+    """Commands 'search'.
+
+    This command searches the messages of a catalog containing some
+    words, or a phrase (see 'ytranslate.search').  If an output
+    directory is specified, the search index is written in an index
+    file, next to the compiled catalog files, and reused as long as
+    the catalog files don't change.  Otherwise, nothing is written.
+
+    """
+
+    name = "search"
+
+    def __init__(self, parser=None):
+        BaseCommand.__init__(self, parser)
+        parser.add_argument("directory",
+                help="the path to the directory containing the catalogs")
+        parser.add_argument("catalog",
+                help="the catalog name to be searched")
+        parser.add_argument("query", nargs='+',
+                help="the words to search (a word followed by '*' " \
+                "matches every word beginning with it)")
+        parser.add_argument("-p", "--phrase", action="store_true",
+                help="search the words in this order, as a phrase")
+        parser.add_argument("-o", "--output", nargs='?',
+                help="the directory in which to keep compiled files " \
+                "and index files (none are written by default)")
+
+    def execute(self, args):
+        """Execute the command."""
+        root_dir = args.directory
+        if not os.path.exists(root_dir):
+            print("The {} directory doesn't exist".format(repr(root_dir)),
+                    file=sys.stderr)
+            sys.exit(1)
+        elif not os.path.isdir(root_dir):
+            print("The {} path doesn't lead to a directory".format(
+                    repr(root_dir)), file=sys.stderr)
+            sys.exit(1)
+
+        cache_dir = args.output
+        loader = FSLoader(root_dir, cache_dir=cache_dir)
+        fullnames = [fullname for fullname in loader.find_files() if \
+                loader.locate(fullname)[0] == args.catalog]
+        if not fullnames:
+            print("The catalog {} cannot be found in {}".format(
+                    repr(args.catalog), repr(root_dir)), file=sys.stderr)
+            sys.exit(1)
+
+        index = path = None
+        if cache_dir:
+            path = os.path.join(cache_dir, args.catalog + ".yti")
+            index = read_index(path, fullnames)
+
+        if index is None:
+            try:
+                results = loader.read_files(fullnames)
+            except ValueError as err:
+                print(err, file=sys.stderr)
+                sys.exit(1)
+
+            for fullname, messages in zip(fullnames, results):
+                loader.merge_file(fullname, messages)
+
+            index = SearchIndex(loader.catalogs[args.catalog].messages)
+            if path:
+                write_index(path, index, fullnames)
+
+        results = index.search(" ".join(args.query), phrase=args.phrase)
+        for address, message in results:
+            print(u"  {}: {}".format(address, message))
+
+        print("{} messages found".format(len(results)), file=sys.stderr)
@@ -0,0 +1,88 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the StatsCommand class, described below."""
+
+from __future__ import print_function
+import os.path
+import sys
+
+from ytranslate.commands.base import BaseCommand
+from ytranslate.stats import Profile
+
+class StatsCommand(BaseCommand):
+
+    """Commands 'stats'.
+
+    This command displays a profile recorded by 'ytranslate.stats'.
+
+    """
+
+    name = "stats"
+
+    def __init__(self, parser=None):
+        BaseCommand.__init__(self, parser)
+        parser.add_argument("profile",
+                help="the path to the JSON file containing the profile")
+        parser.add_argument("-s", "--sort", default="calls",
+                choices=["calls", "misses", "time"],
+                help="the column used to sort addresses")
+        parser.add_argument("-n", "--number", type=int, default=20,
+                help="the number of addresses to display")
+
+    def execute(self, args):
+        """Execute the command."""
+        path = args.profile
+        if not os.path.isfile(path):
+            print("The {} file doesn't exist".format(repr(path)),
+                    file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            profile = Profile.load(path)
+        except ValueError as err:
+            print("Cannot read the {} profile: {}".format(repr(path), err),
+                    file=sys.stderr)
+            sys.exit(1)
+
+        addresses = sorted(profile.addresses.items(), key=lambda item:
+                (-getattr(item[1], args.sort), item[0]))
+        calls = sum(stats.calls for stats in profile.addresses.values())
+        misses = sum(stats.misses for stats in profile.addresses.values())
+        duration = sum(stats.time for stats in profile.addresses.values())
+        print("{} addresses, {} calls, {} misses, {:.6f}s".format(
+                len(addresses), calls, misses, duration))
+        print("  {:>8} {:>8} {:>10} {:>10} {:>10}  {}".format("calls",
+                "misses", "time", "count", "format", "address"))
+        for address, stats in addresses[:args.number]:
+            print("  {:>8} {:>8} {:>10.6f} {:>10.6f} {:>10.6f}  {}".format(
+                    stats.calls, stats.misses, stats.time, stats.count_time,
+                    stats.format_time, address))
+            for branch, number in sorted(stats.branches.items()):
+                print("  {:>8} {} calls selecting {}".format("", number,
+                        branch))
@@ -41,7 +41,9 @@ class UpdateCommand(BaseCommand):
 
     """Commands 'update'.
 
-    This command updates a given catalog with a default model.
+    This command updates one or several catalogs with a default model.
+    The catalogs are loaded once, and only the files containing
+    missing messages are written.
 
     """
 
@@ -51,10 +53,14 @@ class UpdateCommand(BaseCommand):
         BaseCommand.__init__(self, parser)
         parser.add_argument("directory",
                 help="the path to the directory containing the catalogs")
-        parser.add_argument("catalog", nargs='?',
-                help="the catalog name to be created or updated")
+        parser.add_argument("catalog", nargs='*',
+                help="the catalog names to be created or updated")
         parser.add_argument("-m", "--model", nargs='?',
                 default="en", help="the model catalog to be used")
+        parser.add_argument("-a", "--all", action="store_true",
+                help="update every catalog except the model")
+        parser.add_argument("-j", "--jobs", type=int, default=1,
+                help="the number of files to write in parallel")
 
     def execute(self, args):
         """Execute the command."""
@@ -70,6 +76,29 @@ class UpdateCommand(BaseCommand):
 
         loader = FSLoader(root_dir)
         loader.load()
-        nb = loader.update_catalog(args.catalog, args.model)
-        print("Successfully updated the '{}' catalog ({})".format(
-                args.catalog, nb))
+        catalogs = list(args.catalog)
+        if args.all:
+            catalogs += [name for name in sorted(loader.catalogs) if \
+                    name != args.model and name not in catalogs]
+
+        if not catalogs:
+            print("No catalog to update, specify catalog names or " \
+                    "use --all", file=sys.stderr)
+            sys.exit(1)
+
+        if args.model not in loader.catalogs:
+            print("The model catalog {} cannot be found in {}".format(
+                    repr(args.model), repr(root_dir)), file=sys.stderr)
+            sys.exit(1)
+
+        if args.jobs > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(args.jobs) as executor:
+                updated = loader.update_catalogs(catalogs, args.model,
+                        executor=executor)
+        else:
+            updated = loader.update_catalogs(catalogs, args.model)
+
+        for name in catalogs:
+            print("Successfully updated the '{}' catalog ({})".format(
+                    name, updated[name]))
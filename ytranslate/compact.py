@@ -0,0 +1,162 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the compact storage of messages.
+
+A catalog usually stores its messages in a dictionary, which uses
+a lot of memory when dozens of catalogs are loaded:  each catalog
+has its own copy of every address, and each message is a separate
+string object.  The compact storage uses:
+
+-   A table of addresses ('KeyTable'), shared by all catalogs.
+    Each address is stored once, interned, with its index.
+-   For each catalog, the messages encoded in UTF-8 in a single
+    buffer, with two arrays containing the position of each message
+    in this buffer ('CompactMessages').  Only the groups of messages
+    selected by a count indicator are kept as dictionaries.
+
+Compact messages are read-only, and slightly slower to retrieve,
+since they have to be decoded.
+
+"""
+
+from array import array
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+try:
+    from sys import intern
+except ImportError:
+    pass
+
+# Markers used instead of a position in the buffer
+MISSING = -1
+GROUP = -2
+
+class KeyTable(object):
+
+    """A table of addresses, shared by several catalogs."""
+
+    def __init__(self):
+        self.indexes = {}
+        self.addresses = []
+
+    def __repr__(self):
+        return "<ytranslate.KeyTable ({} addresses)>".format(
+                len(self.addresses))
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def add(self, address):
+        """Add an address if needed, return its index."""
+        index = self.indexes.get(address)
+        if index is None:
+            address = intern(str(address))
+            index = len(self.addresses)
+            self.addresses.append(address)
+            self.indexes[address] = index
+
+        return index
+
+class CompactMessages(Mapping):
+
+    """The read-only, compact messages of a catalog.
+
+    This object behaves like the dictionary of messages it has been
+    built from, but doesn't support modifications.
+
+    """
+
+    def __init__(self, table, messages):
+        self.table = table
+        self.indexes = table.indexes
+        for address in messages.keys():
+            table.add(address)
+
+        self.starts = array("i", [MISSING]) * len(table)
+        self.ends = array("i", [MISSING]) * len(table)
+        self.groups = {}
+        chunks = []
+        position = 0
+        for address, message in messages.items():
+            index = self.indexes[address]
+            if isinstance(message, dict):
+                self.starts[index] = GROUP
+                self.groups[index] = message
+            else:
+                data = message.encode("utf-8")
+                chunks.append(data)
+                self.starts[index] = position
+                position += len(data)
+                self.ends[index] = position
+
+        self.buffer = b"".join(chunks)
+        self.size = len(messages)
+
+    def __repr__(self):
+        return "<ytranslate.CompactMessages ({} messages)>".format(self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        addresses = self.table.addresses
+        for index, start in enumerate(self.starts):
+            if start != MISSING:
+                yield addresses[index]
+
+    def __contains__(self, address):
+        index = self.indexes.get(address)
+        return index is not None and index < len(self.starts) and \
+                self.starts[index] != MISSING
+
+    def __getitem__(self, address):
+        message = self.get(address)
+        if message is None:
+            raise KeyError(address)
+
+        return message
+
+    def get(self, address, default=None):
+        """Return the message at this address, or the default value."""
+        index = self.indexes.get(address)
+        if index is None or index >= len(self.starts):
+            return default
+
+        start = self.starts[index]
+        if start < 0:
+            if start == GROUP:
+                return self.groups[index]
+
+            return default
+
+        return self.buffer[start:self.ends[index]].decode("utf-8")
@@ -0,0 +1,119 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing functions to compile catalog files.
+
+Parsing YAML is the slowest step of loading catalogs.  A catalog file
+can be compiled:  the flattened messages of the catalog are written
+in a binary file (using the 'marshal' module) which is much faster
+to read.  Each compiled file stores the modification time and size
+of the YAML file it has been compiled from, so that a compiled file
+is ignored as soon as its YAML file changes.
+
+Compiled files bear the name of the YAML file with a 'c' appended
+('en.yml' is compiled into 'en.ymlc').  They can be placed in the
+catalog directory itself, or in a separate directory with the same
+structure.
+
+"""
+
+from functools import partial
+import marshal
+import os
+import os.path
+import sys
+
+from ytranslate.catalog import Catalog
+from ytranslate.files import write_file
+
+MAGIC = "ytranslate-compiled"
+VERSION = tuple(sys.version_info[:2])
+
+def compiled_path(fullname, root_dir, cache_dir):
+    """Return the path of the compiled file of a catalog file."""
+    relative = os.path.relpath(fullname, root_dir)
+    return os.path.join(cache_dir, relative + "c")
+
+def read_compiled(path, fullname):
+    """Return the messages stored in a compiled file.
+
+    If the compiled file doesn't exist, cannot be read, or has been
+    compiled from an older version of the catalog file, return None.
+
+    """
+    try:
+        stat = os.stat(fullname)
+        with open(path, "rb") as file:
+            data = marshal.load(file)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(data, tuple) or len(data) != 5:
+        return None
+
+    magic, version, mtime, size, messages = data
+    if magic != MAGIC or version != VERSION or mtime != stat.st_mtime or \
+            size != stat.st_size:
+        return None
+
+    return messages
+
+def write_compiled(path, fullname, messages):
+    """Write the messages of a catalog file in a compiled file.
+
+    The compiled file is first written under a temporary name, then
+    renamed, so that a compiled file is never read half-written.
+
+    """
+    stat = os.stat(fullname)
+    data = (MAGIC, VERSION, stat.st_mtime, stat.st_size, messages)
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent)
+
+    write_file(path, partial(marshal.dump, data), binary=True)
+
+def compile_file(fullname, path, backend=None):
+    """Compile a catalog file.
+
+    Return the number of compiled messages.
+
+    """
+    kwargs = {}
+
+    # If Python 3, enforce the encoding to 'utf-8'
+    if sys.version_info.major == 3:
+        kwargs["encoding"] = "utf-8"
+
+    with open(fullname, "r", **kwargs) as file:
+        data = file.read()
+
+    catalog = Catalog(fullname, backend)
+    catalog.read_YAML(data)
+    write_compiled(path, fullname, catalog.messages)
+    return len(catalog.messages)
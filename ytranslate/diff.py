@@ -0,0 +1,162 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the diff engine, described below.
+
+The 'diff' function compares a catalog with a model catalog and
+returns a CatalogDiff object, listing:
+
+-   The missing addresses (in the model, but not in the catalog).
+-   The obsolete addresses (in the catalog, but not in the model).
+-   The addresses whose placeholders differ.
+-   The addresses whose groups of messages selected by a count
+    indicator differ (a message instead of a group, or different
+    numbers).
+
+Addresses are compared with set operations, so that catalogs of
+hundreds of thousands of messages can be compared quickly.
+
+"""
+
+from string import Formatter
+
+_formatter = Formatter()
+
+class CatalogDiff(object):
+
+    """The differences between a catalog and its model.
+
+    The 'missing' and 'obsolete' attributes are sorted lists of
+    addresses.  The 'placeholders' dictionary associates each address
+    whose placeholders differ with a tuple (placeholders missing from
+    the catalog, placeholders absent from the model).  The 'plurals'
+    dictionary associates each address whose group of messages differs
+    with a tuple (numbers of the model, numbers of the catalog), each
+    being None if the message isn't a group.
+
+    """
+
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self.missing = []
+        self.obsolete = []
+        self.placeholders = {}
+        self.plurals = {}
+
+    def __repr__(self):
+        return "<ytranslate.CatalogDiff {} ({} missing, {} obsolete, " \
+                "{} placeholders, {} plurals)>".format(repr(self.name),
+                len(self.missing), len(self.obsolete),
+                len(self.placeholders), len(self.plurals))
+
+    def __bool__(self):
+        return bool(self.missing or self.obsolete or self.placeholders or
+                self.plurals)
+
+    __nonzero__ = __bool__
+
+    def to_dict(self):
+        """Return the differences as a dictionary."""
+        return {
+            "catalog": self.name,
+            "model": self.model,
+            "missing": self.missing,
+            "obsolete": self.obsolete,
+            "placeholders": {address: {"missing": sorted(missing),
+                    "extra": sorted(extra)} for address, (missing, extra) in
+                    self.placeholders.items()},
+            "plurals": {address: {"model": model, "catalog": catalog} for
+                    address, (model, catalog) in self.plurals.items()},
+        }
+
+def placeholders(message):
+    """Return the set of placeholders used in a message.
+
+    If the message is a group of messages, return the placeholders
+    used in any message of the group.  Only the name of the argument
+    is kept ('user' for '{user.name}').
+
+    """
+    if isinstance(message, dict):
+        names = set()
+        for text in message.values():
+            names |= placeholders(text)
+        return names
+
+    if "{" not in message:
+        return set()
+
+    names = set()
+    try:
+        for literal, field, spec, conversion in _formatter.parse(message):
+            if field is not None:
+                names.add(field.split(".", 1)[0].split("[", 1)[0])
+    except ValueError:
+        # The message is invalid, its placeholders cannot be found
+        pass
+
+    return names
+
+def shape(message):
+    """Return the sorted numbers of a group, or None for a message."""
+    if isinstance(message, dict):
+        return sorted(str(number) for number in message.keys())
+
+    return None
+
+def diff(catalog, model):
+    """Compare a catalog with its model, return a CatalogDiff object."""
+    catalog.load_pending()
+    model.load_pending()
+    result = CatalogDiff(catalog.name, model.name)
+    messages = catalog.messages
+    references = model.messages
+    addresses = set(messages.keys())
+    expected = set(references.keys())
+    result.missing = sorted(expected - addresses)
+    result.obsolete = sorted(addresses - expected)
+    for address in expected & addresses:
+        message = messages[address]
+        reference = references[address]
+        if isinstance(message, dict) or isinstance(reference, dict):
+            numbers = shape(message)
+            reference_numbers = shape(reference)
+            if numbers != reference_numbers:
+                result.plurals[address] = (reference_numbers, numbers)
+        elif message == reference or ("{" not in message and
+                "{" not in reference):
+            continue
+
+        names = placeholders(message)
+        reference_names = placeholders(reference)
+        if names != reference_names:
+            result.placeholders[address] = (reference_names - names,
+                    names - reference_names)
+
+    return result
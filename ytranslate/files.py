@@ -0,0 +1,65 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the functions to write files, described below."""
+
+import os
+import sys
+
+def write_file(fullname, content, binary=False):
+    """Write a file atomically.
+
+    The content is first written in a temporary file in the same
+    directory, which then replaces the file, so that the file is
+    never read half-written.  The content can be a string, or
+    a function called with the open file to write it.  If 'binary'
+    is set, the file is open in binary mode.  Otherwise, the content
+    is written as UTF-8 text.
+
+    """
+    kwargs = {}
+    mode = "wb" if binary else "w"
+
+    # If Python 3, enforce the encoding to 'utf-8'
+    if not binary and sys.version_info.major == 3:
+        kwargs["encoding"] = "utf-8"
+
+    temporary = "{}.{}.tmp".format(fullname, os.getpid())
+    try:
+        with open(temporary, mode, **kwargs) as file:
+            if callable(content):
+                content(file)
+            else:
+                file.write(content)
+
+        replace = getattr(os, "replace", os.rename)
+        replace(temporary, fullname)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
@@ -32,9 +32,106 @@
 import os
 import os.path
 import sys
+from functools import partial
+from threading import Event, Thread
+from timeit import default_timer as timer
 
+from ytranslate.backend import get_backend
 from ytranslate.catalog import Catalog
+from ytranslate.compact import CompactMessages, KeyTable
+from ytranslate.compiler import compiled_path, read_compiled, write_compiled
+from ytranslate.files import write_file
 from ytranslate.loader import Loader
+from ytranslate.stats import FileReport, LoadReport
+
+def read_file(fullname, backend=None, compiled=None, report=False,
+        stream=False):
+    """Read a catalog file and return its flattened messages.
+
+    If the path of a compiled file is specified, this compiled file
+    is read if it's up-to-date, or written otherwise.  This function
+    can be called in another process (see 'FSLoader.load').
+
+    If 'stream' is set, the file is parsed and flattened while it's
+    read (see 'Catalog.read_stream'), instead of being read whole.
+    In this case, the reported parse time includes the time spent
+    to read and flatten the file.
+
+    If 'report' is set, return a tuple containing the messages and
+    a FileReport object (see 'ytranslate.stats').
+
+    """
+    file_report = FileReport(fullname) if report else None
+    begin = timer()
+    if compiled:
+        messages = read_compiled(compiled, fullname)
+        if messages is not None:
+            if file_report:
+                file_report.read = timer() - begin
+                file_report.compiled = True
+                file_report.messages = len(messages)
+                return messages, file_report
+
+            return messages
+
+    kwargs = {}
+
+    # If Python 3, enforce the encoding to 'utf-8'
+    if sys.version_info.major == 3:
+        kwargs["encoding"] = "utf-8"
+
+    catalog = Catalog(fullname, backend)
+    if stream:
+        try:
+            with open(fullname, "r", **kwargs) as file:
+                parsing = timer()
+                catalog.read_stream(file)
+        except (IOError, ValueError) as e:
+            raise ValueError("cannot load the {} file: " \
+                    "{}".format(repr(fullname), e))
+
+        flattening = end = timer()
+    else:
+        try:
+            with open(fullname, "r", **kwargs) as file:
+                data = file.read()
+        except IOError as e:
+            raise ValueError("cannot load the {} file: " \
+                    "{}".format(repr(fullname), e))
+
+        parsing = timer()
+        try:
+            tree = catalog.parse_YAML(data)
+            flattening = timer()
+            catalog.read_dictionary(tree)
+        except ValueError as e:
+            raise ValueError("cannot load the {} file: " \
+                    "{}".format(repr(fullname), e))
+
+        end = timer()
+
+    if compiled:
+        try:
+            write_compiled(compiled, fullname, catalog.messages)
+        except (IOError, OSError):
+            # The cache directory may be read-only
+            pass
+
+    if file_report:
+        file_report.read = parsing - begin
+        file_report.parse = flattening - parsing
+        file_report.flatten = end - flattening
+        if stream:
+            try:
+                file_report.bytes = os.path.getsize(fullname)
+            except OSError:
+                pass
+        else:
+            file_report.bytes = len(data.encode("utf-8"))
+        file_report.messages = len(catalog.messages)
+        return catalog.messages, file_report
+
+    return catalog.messages
 
 class FSLoader(Loader):
 
@@ -46,55 +143,442 @@ class FSLoader(Loader):
     parent directory.  The directories contained in this root
     directory are recursively explored for catalog files.
 
+    If a cache directory is specified, the compiled catalog files
+    it contains are read instead of the YAML files, as long as they
+    are up-to-date (see 'ytranslate.compiler').  Catalog files that
+    haven't been compiled, or have been modified since, are compiled
+    into the cache directory when they are read.
+
+    The YAML backend used by the catalogs can be specified (see
+    'ytranslate.backend').
+
+    Catalog files can be read and parsed in parallel, using an
+    executor of the 'concurrent.futures' module.  Since parsing YAML
+    is CPU-bound, a 'ProcessPoolExecutor' should be preferred.
+    The executor isn't shut down by the loader.
+
+    Fallback chains can be specified for catalogs, as a dictionary
+    associating a catalog name with the list of catalogs to search,
+    in order, if a message cannot be found.  For instance:
+        FSLoader(root_dir, fallbacks={"fr-CA": ["fr", "en"]})
+    A merged view of these catalogs is built when the catalogs are
+    loaded or reloaded, so that a message is found with a single
+    dictionary lookup.  The 'views' dictionary contains these views,
+    returned by 'get_catalog' and used by 'select'.
+
+    In compact mode, the catalogs are stored in a compact, read-only
+    form once loaded (see the 'compact' method).
+
+    If a cache size is specified, the catalogs returned by
+    'get_catalog' (and used by 'select') cache up to this number
+    of rendered messages (see 'Catalog.enable_cache').
+
+    If 'profile' is set, the time spent to read, parse, flatten and
+    merge each catalog file is recorded in the 'report' attribute,
+    a LoadReport object (see 'ytranslate.stats').
+
+    In stream mode, catalog files are flattened while they are
+    parsed, without reading the whole file or building the nested
+    dictionary first (see 'Catalog.read_stream').  This reduces the
+    memory needed to load large files.
+
     """
 
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, lazy=False, cache_dir=None, backend=None,
+            executor=None, fallbacks=None, compact=False, cache_size=None,
+            profile=False, stream=False):
+        if lazy and compact:
+            raise ValueError("a lazy loader cannot use the compact mode")
+
         self.root_dir = root_dir
+        self.lazy = lazy
+        self.cache_dir = cache_dir
+        self.backend = get_backend(backend)
+        self.executor = executor
+        self.fallbacks = dict(fallbacks or {})
+        self.views = {}
+        self.compact_mode = compact
+        self.cache_size = cache_size
+        self.report = LoadReport() if profile else None
+        self.stream = stream
+        self.table = None
         self.catalogs = {}
         self.namespaces = {}
+        self.files = {}
+        self.pending_files = set()
 
     def __repr__(self):
         return "<ytranslate.FSLoader (root={})>".format(repr(self.root_dir))
 
     def load(self):
-        """Load the catalogs."""
-        root_dir = self.root_dir
-        len_root = len(root_dir.split(os.sep))
+        """Load the catalogs.
+
+        If the loader is lazy, the catalog files are only indexed:
+        a file is read the first time an address of its namespace
+        is retrieved, or when its catalog is selected.  Otherwise,
+        every file is read and parsed immediately, which also
+        validates them.  If the loader has an executor, the files are
+        parsed in parallel, but they are still merged in the same order.
+
+        """
+        fullnames = list(self.find_files())
+        if self.lazy:
+            for fullname in fullnames:
+                self.index_file(fullname)
+        else:
+            stats = [self.stat(fullname) for fullname in fullnames]
+            results = self.read_files(fullnames)
+            for fullname, stat, messages in zip(fullnames, stats, results):
+                self.merge_file(fullname, messages, stat)
+
+            for name in self.fallbacks:
+                self.build_view(name)
+
+            if self.compact_mode:
+                self.compact()
+
+    def find_files(self):
+        """Return the full names of the catalog files."""
         for base, dirs, files in os.walk(self.root_dir):
             for file in files:
                 if len(file) > 4 and file.endswith(".yml"):
-                    fullname = os.path.join(base, file)
-                    kwargs = {}
-
-                    # If Python 3, enforce the encoding to 'utf-8'
-                    if sys.version_info.major == 3:
-                        kwargs["encoding"] = "utf-8"
-
-                    try:
-                        with open(fullname, "r", **kwargs) as file:
-                            data = file.read()
-                    except IOError as e:
-                        raise ValueError("cannot load the {} file: " \
-                                "{}".format(repr(fullname), e))
-
-                    namespace = ".".join(fullname[:-4].split(
-                            os.sep)[len_root + 1:])
-
-                    parent = fullname.split(os.sep)[len_root]
-                    if parent.endswith(".yml"):
-                        parent = parent[:-4]
-
-                    catalog = Catalog(fullname)
-                    catalog.read_YAML(data)
-                    if parent != namespace:
-                        if parent not in self.catalogs:
-                            self.catalogs[parent] = Catalog(parent)
-                        parent = self.catalogs[parent]
-                        parent.copy_from(catalog,
-                                namespace=namespace)
-                    else:
-                        self.catalogs[namespace] = catalog
-                    self.namespaces[namespace] = catalog
+                    yield os.path.join(base, file)
+
+    def locate(self, fullname):
+        """Return the parent catalog and namespace of a file."""
+        len_root = len(self.root_dir.split(os.sep))
+        namespace = ".".join(fullname[:-4].split(os.sep)[len_root + 1:])
+        parent = fullname.split(os.sep)[len_root]
+        if parent.endswith(".yml"):
+            parent = parent[:-4]
+
+        return parent, namespace
+
+    def stat(self, fullname):
+        """Return the modification time and size of a file, or None."""
+        try:
+            stat = os.stat(fullname)
+        except OSError:
+            return None
+
+        return (stat.st_mtime, stat.st_size)
+
+    def compiled_path(self, fullname):
+        """Return the path of the compiled file, or None."""
+        if self.cache_dir:
+            return compiled_path(fullname, self.root_dir, self.cache_dir)
+
+        return None
+
+    def index_file(self, fullname):
+        """Index a catalog file, to be loaded when it's needed."""
+        parent, namespace = self.locate(fullname)
+        if parent not in self.catalogs:
+            self.catalogs[parent] = Catalog(parent, self.backend)
+
+        self.catalogs[parent].pending[namespace] = partial(
+                self.load_file, fullname)
+        self.pending_files.add(fullname)
+
+    def read_files(self, fullnames):
+        """Read the catalog files, return the list of their messages.
+
+        If the loader has an executor, the files are read in parallel.
+
+        """
+        compiled = [self.compiled_path(fullname) for fullname in fullnames]
+        backends = [self.backend] * len(fullnames)
+        reports = [self.report is not None] * len(fullnames)
+        streams = [self.stream] * len(fullnames)
+        if self.executor is None:
+            results = list(map(read_file, fullnames, backends, compiled,
+                    reports, streams))
+        else:
+            # Send the files by chunks to limit the communication costs
+            chunksize = max(1, len(fullnames) // 64)
+            results = list(self.executor.map(read_file, fullnames, backends,
+                    compiled, reports, streams, chunksize=chunksize))
+
+        if self.report is not None:
+            for i, (messages, file_report) in enumerate(results):
+                self.report.add(file_report)
+                results[i] = messages
+
+        return results
+
+    def load_file(self, fullname):
+        """Read a catalog file and merge it into its parent catalog."""
+        stat = self.stat(fullname)
+        messages = self.read_files([fullname])[0]
+        self.merge_file(fullname, messages, stat)
+        self.pending_files.discard(fullname)
+
+    def merge_file(self, fullname, messages, stat=None):
+        """Merge the messages of a catalog file into its parent catalog."""
+        begin = timer()
+        parent, namespace = self.locate(fullname)
+        catalog = Catalog(fullname, self.backend)
+        catalog.messages = messages
+        catalog.compile_plurals()
+        if parent != namespace:
+            if parent not in self.catalogs:
+                self.catalogs[parent] = Catalog(parent, self.backend)
+            parent = self.catalogs[parent]
+            parent.copy_from(catalog,
+                    namespace=namespace)
+        else:
+            self.catalogs[namespace] = catalog
+        self.namespaces[namespace] = catalog
+        self.files[fullname] = (stat, messages)
+        if self.report is not None:
+            self.report.get(fullname).merge = timer() - begin
+
+    def reload(self):
+        """Reload the catalog files that have changed.
+
+        The catalog files are compared with the loaded ones using
+        their modification time and size.  Only the modified, added
+        or deleted files are read, and the messages of the parent
+        catalogs are then replaced at once:  a message retrieved at
+        the same time comes either from the old or the new version
+        of the catalog, never from a half-updated one.  If a catalog
+        file cannot be parsed, a ValueError is raised and no catalog
+        is modified.
+
+        Return a tuple of three lists: the modified, added and deleted
+        catalog files.
+
+        """
+        if self.table is not None:
+            raise ValueError("compact catalogs cannot be reloaded")
+
+        changed = []
+        added = []
+        stats = {}
+        for fullname in self.find_files():
+            stat = self.stat(fullname)
+            stats[fullname] = stat
+            if fullname in self.files:
+                if self.files[fullname][0] != stat:
+                    changed.append(fullname)
+            elif fullname not in self.pending_files:
+                added.append(fullname)
+
+        deleted = [fullname for fullname in self.files if
+                fullname not in stats]
+        deleted_pending = [fullname for fullname in self.pending_files if
+                fullname not in stats]
+
+        # Files not loaded yet are simply indexed in lazy mode
+        if self.lazy:
+            for fullname in added:
+                self.index_file(fullname)
+            added = []
+
+        for fullname in deleted_pending:
+            parent, namespace = self.locate(fullname)
+            self.catalogs[parent].pending.pop(namespace, None)
+            self.pending_files.discard(fullname)
+
+        # Read all the files before modifying the catalogs
+        read = changed + added
+        results = dict(zip(read, self.read_files(read)))
+        parents = sorted(set(self.locate(fullname)[0] for fullname in \
+                changed + added + deleted))
+        for parent in parents:
+            if parent not in self.catalogs:
+                self.catalogs[parent] = Catalog(parent, self.backend)
+
+        # Namespaces can't be loaded while their catalog is patched
+        locks = [self.catalogs[parent].pending_lock for parent in parents]
+        for lock in locks:
+            lock.acquire()
+
+        try:
+            self.patch(changed + added + deleted, results, stats)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+        self.refresh_views()
+        return changed, added, deleted
+
+    def patch(self, fullnames, results, stats):
+        """Replace the messages of modified, added or deleted files.
+
+        The 'reload' method calls 'patch' once the files have been
+        read, and while the parent catalogs are locked.  The messages
+        of each parent catalog are patched in a copy, which then
+        replaces the messages of the catalog.  The same goes for its
+        compiled groups of messages.
+
+        """
+        patched = {}
+        deleted = set()
+        for fullname in fullnames:
+            parent, namespace = self.locate(fullname)
+            catalog = self.catalogs[parent]
+            if parent not in patched:
+                patched[parent] = (dict(catalog.messages),
+                        dict(catalog.plurals))
+            messages, plurals = patched[parent]
+
+            prefix = ""
+            if namespace and parent != namespace:
+                prefix = namespace + "."
+
+            if fullname in self.files:
+                for address in self.files[fullname][1]:
+                    messages.pop(prefix + address, None)
+                    plurals.pop(prefix + address, None)
+
+            if fullname in results:
+                for address, message in results[fullname].items():
+                    messages[prefix + address] = message
+
+                file_catalog = Catalog(fullname, self.backend)
+                file_catalog.messages = results[fullname]
+                file_catalog.compile_plurals()
+                for address, plural in file_catalog.plurals.items():
+                    plurals[prefix + address] = plural.copy(prefix + address)
+
+                self.namespaces[namespace] = file_catalog
+                self.files[fullname] = (stats[fullname], results[fullname])
+            else:
+                deleted.add(namespace)
+                del self.files[fullname]
+
+        # A namespace is shared by all catalogs: only remove it if
+        # no file of any catalog defines it anymore
+        for fullname in self.files:
+            deleted.discard(self.locate(fullname)[1])
+
+        for namespace in deleted:
+            self.namespaces.pop(namespace, None)
+
+        for parent, (messages, plurals) in patched.items():
+            self.catalogs[parent].plurals = plurals
+            self.catalogs[parent].messages = messages
+
+    def compact(self):
+        """Store the catalogs in a compact, read-only form.
+
+        All the catalogs and views share the same table of addresses,
+        and their messages are stored in a single buffer per catalog
+        (see 'ytranslate.compact').  The messages of each catalog file
+        aren't kept:  compact catalogs can neither be reloaded nor
+        updated.
+
+        """
+        table = KeyTable()
+        catalogs = sorted(self.catalogs.items()) + sorted(self.views.items())
+        for name, catalog in catalogs:
+            catalog.messages = CompactMessages(table, catalog.messages)
+            catalog.index = None
+
+        compacted = [catalog for name, catalog in catalogs]
+        for catalog in self.namespaces.values():
+            if not any(catalog is other for other in compacted):
+                catalog.messages = {}
+
+        self.files.clear()
+        self.table = table
+
+    def watch(self, interval=1, callback=None, errback=None):
+        """Reload the modified catalog files periodically.
+
+        A background thread calls 'reload' every 'interval' seconds.
+        If files have been modified, the callback, if any, is called
+        with the three lists returned by 'reload'.  If an error
+        occurs, the errback, if any, is called with the exception, and
+        the modified files will be reloaded at the next attempt.
+
+        Return a 'threading.Event' object:  set it to stop watching.
+
+        """
+        stop = Event()
+
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    result = self.reload()
+                except ValueError as err:
+                    if errback is not None:
+                        errback(err)
+                else:
+                    if callback is not None and any(result):
+                        callback(*result)
+
+        thread = Thread(target=poll, name="ytranslate-watch")
+        thread.daemon = True
+        thread.start()
+        return stop
+
+    def get_catalog(self, catalog):
+        """Return the catalog of the specified name.
+
+        The catalog files that haven't been read yet are read
+        at this point.
+
+        """
+        if catalog in self.fallbacks:
+            name = catalog
+            catalog = self.views.get(name)
+            if catalog is None:
+                catalog = self.build_view(name)
+        else:
+            catalog = self.catalogs[catalog]
+            catalog.load_pending()
+
+        if self.cache_size and catalog.cache is None:
+            catalog.enable_cache(self.cache_size)
+
+        return catalog
+
+    def build_view(self, name):
+        """Build the merged view of a catalog and its fallbacks.
+
+        The view contains the messages of all the catalogs of the
+        chain, the first catalog of the chain having priority.
+        The 'origins' dictionary of the view associates the addresses
+        taken from a fallback catalog with the name of this catalog.
+        If the view already exists, it is updated in place, so that
+        the selected catalog remains valid.
+
+        """
+        chain = [name] + list(self.fallbacks.get(name, ()))
+        messages = {}
+        plurals = {}
+        origins = {}
+        for locale in reversed(chain):
+            catalog = self.catalogs.get(locale)
+            if catalog is None:
+                continue
+
+            catalog.load_pending()
+            messages.update(catalog.messages)
+            plurals.update(catalog.plurals)
+            if locale == name:
+                for address in catalog.messages:
+                    origins.pop(address, None)
+            else:
+                for address in catalog.messages:
+                    origins[address] = locale
+
+        view = self.views.get(name)
+        if view is None:
+            view = Catalog(name, self.backend)
+            self.views[name] = view
+
+        view.origins = origins
+        view.plurals = plurals
+        view.messages = messages
+        return view
+
+    def refresh_views(self):
+        """Update the views already built."""
+        for name in list(self.views.keys()):
+            self.build_view(name)
 
     def update_catalog(self, catalog, model, missing="???"):
         """Update the given catalog.
@@ -106,37 +590,70 @@ class FSLoader(Loader):
         Return the number of updated messages.
 
         """
-        nb = 0
+        return self.update_catalogs([catalog], model, missing)[catalog]
+
+    def update_catalogs(self, catalogs, model, missing="???",
+            executor=None):
+        """Update several catalogs with the same model.
+
+        The messages of the model are browsed once, to update every
+        catalog.  Only the files of the namespaces containing missing
+        messages are then written.  If an executor is specified, these
+        files are written in parallel (see 'save_catalogs').
+
+        Return a dictionary associating each catalog name with the
+        number of updated messages.
+
+        """
+        if self.table is not None:
+            raise ValueError("compact catalogs cannot be updated")
+
         model = self.catalogs[model]
-        if catalog not in self.catalogs:
-            catalog = Catalog(catalog)
-            self.catalogs[catalog.name] = catalog
-        else:
-            catalog = self.catalogs[catalog]
+        model.load_pending()
+        targets = []
+        for name in catalogs:
+            if name not in self.catalogs:
+                catalog = Catalog(name, self.backend)
+                self.catalogs[name] = catalog
+            else:
+                catalog = self.catalogs[name]
+                catalog.load_pending()
+
+            targets.append(catalog)
 
-        # Write the catalog with missing information
+        # Write the catalogs with missing information
+        updated = dict((catalog.name, 0) for catalog in targets)
         for key, value in model.messages.items():
-            replace = missing
-            if isinstance(value, dict):
-                replace = value.copy()
-                for nkey in replace.keys():
-                    replace[nkey] = missing
+            for catalog in targets:
+                if key in catalog.messages:
+                    continue
 
-            if key not in catalog.messages:
-                nb += 1
-                catalog.messages[key] = replace
+                replace = missing
+                if isinstance(value, dict):
+                    replace = value.copy()
+                    for nkey in replace.keys():
+                        replace[nkey] = missing
 
-        # Finally, write the updated (or newly-created) catalog
-        self.save_catalog(catalog)
+                updated[catalog.name] += 1
+                catalog.set_message(key, replace)
 
-        return nb
+        # Finally, write the updated (or newly-created) catalogs
+        self.save_catalogs(targets, dirty=True, executor=executor)
+        self.refresh_views()
 
-    def save(self):
-        """Save all catalogs in the file system."""
-        for namespace, catalog in self.namespaces.items():
-            self.save_catalog(catalog)
+        return updated
 
-    def save_catalog(self, catalog):
+    def save(self, dirty=False):
+        """Save all catalogs in the file system.
+
+        See 'save_catalog' for the meaning of the 'dirty' argument.
+
+        """
+        catalogs = [catalog for name, catalog in sorted(
+                self.catalogs.items())]
+        self.save_catalogs(catalogs, dirty=dirty)
+
+    def save_catalog(self, catalog, dirty=False):
         """Save the specified catalog in the file system.
 
         Each catalog stores, in its name, the full path leading to
@@ -146,27 +663,83 @@ class FSLoader(Loader):
         file and write into it.  An IOError exception is bound to
         be raised if things didn't work for some reason.
 
+        If 'dirty' is set, only the files of the namespaces containing
+        messages modified with 'Catalog.set_message' are written (see
+        'Catalog.dirty').  Messages modified otherwise (with
+        'Catalog.read_YAML' or in 'Catalog.messages', for instance)
+        aren't recorded, so all files are written by default.
+        Each file is first written under a temporary name, then
+        renamed, so that a catalog file is never read half-written.
+        The YAML content is emitted directly to the file (see
+        'Catalog.write_stream').
+
+        Return the list of written files.
+
+        """
+        return self.save_catalogs([catalog], dirty=dirty)
+
+    def save_catalogs(self, catalogs, dirty=False, executor=None):
+        """Save several catalogs in the file system.
+
+        See 'save_catalog' for the meaning of the 'dirty' argument.
+        If an executor of the 'concurrent.futures' module is specified,
+        the files are written in parallel.  Since the catalogs are
+        shared, a 'ThreadPoolExecutor' should be used.
+
+        Return the list of written files.
+
         """
-        name = catalog.name
-        parent_directory = os.path.join(self.root_dir, name)
-        kwargs = {}
-        # If Python 3, enforce the encoding to 'utf-8'
-        if sys.version_info.major == 3:
-            kwargs["encoding"] = "utf-8"
-
-        for namespace in self.namespaces.keys():
-            if namespace:
-                fullname = os.path.join(parent_directory,
-                        namespace.replace(".", os.path.sep) + ".yml")
+        fullnames = []
+        contents = []
+        for catalog in catalogs:
+            catalog.load_pending()
+            name = catalog.name
+            if dirty:
+                namespaces = self.dirty_namespaces(catalog)
             else:
-                parent_directory = self.root_dir
-                fullname = os.path.join(parent_directory, name + ".yml")
+                namespaces = sorted(self.namespaces.keys())
+
+            for namespace in namespaces:
+                if namespace:
+                    fullname = os.path.join(self.root_dir, name,
+                            namespace.replace(".", os.path.sep) + ".yml")
+                else:
+                    fullname = os.path.join(self.root_dir, name + ".yml")
+
+                # Create the directory structure if necessary
+                parent = os.path.split(fullname)[0]
+                if not os.path.exists(parent):
+                    os.makedirs(parent)
+
+                fullnames.append(fullname)
+                contents.append(partial(catalog.write_stream,
+                        root=namespace))
+
+        if executor is None:
+            for fullname, content in zip(fullnames, contents):
+                write_file(fullname, content)
+        else:
+            list(executor.map(write_file, fullnames, contents))
+
+        for catalog in catalogs:
+            catalog.dirty.clear()
+
+        return fullnames
 
-            # Create the directory structure if necessary
-            parent = os.path.split(fullname)[0]
-            if not os.path.exists(parent):
-                os.makedirs(parent)
+    def dirty_namespaces(self, catalog):
+        """Return the sorted namespaces with modified messages.
 
-            yaml = catalog.write_YAML(namespace)
-            with open(fullname, "w", **kwargs) as file:
-                file.write(yaml)
+        Each modified message belongs to the deepest namespace
+        containing it.
+
+        """
+        namespaces = set()
+        for address in catalog.dirty:
+            names = address.split(".")
+            for i in range(len(names) - 1, -1, -1):
+                namespace = ".".join(names[:i])
+                if namespace in self.namespaces:
+                    namespaces.add(namespace)
+                    break
+
+        return sorted(namespaces)
@@ -0,0 +1,135 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the KeyIndex class, described below."""
+
+from bisect import bisect_left, insort
+
+class KeyIndex(object):
+
+    """A sorted index of the addresses of a catalog.
+
+    Addresses sharing the same namespace are contiguous once sorted:
+    the addresses in the 'ui' namespace are all greater than or equal
+    to 'ui.' and lower than 'ui/' (the '/' character follows the '.'
+    character).  Two binary searches are therefore enough to find
+    the addresses in a namespace, or to count them, without browsing
+    the other ones.
+
+    The 'namespaces' dictionary associates each namespace with the
+    sorted names of its direct sub-namespaces, so that they can be
+    listed without browsing the addresses.
+
+    The index is built for a dictionary of messages.  The catalog
+    informs it of added addresses (see 'update'), and builds a new
+    index if messages have been removed or replaced.
+
+    """
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.keys = sorted(messages.keys())
+        self.namespaces = {}
+        children = {}
+        for key in self.keys:
+            self.add_namespaces(key, children)
+
+        for namespace, names in children.items():
+            self.namespaces[namespace] = sorted(names)
+
+    def __repr__(self):
+        return "<ytranslate.KeyIndex ({} keys)>".format(len(self.keys))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add_namespaces(self, key, children=None):
+        """Add the namespaces containing an address.
+
+        If a dictionary of sets is specified, the sub-namespaces are
+        added in these sets (used to build the index).  Otherwise,
+        they are inserted in the sorted lists of 'namespaces'.
+
+        """
+        names = key.split(".")
+        parent = ""
+        for name in names[:-1]:
+            if children is not None:
+                children.setdefault(parent, set()).add(name)
+            else:
+                siblings = self.namespaces.setdefault(parent, [])
+                position = bisect_left(siblings, name)
+                if position == len(siblings) or siblings[position] != name:
+                    siblings.insert(position, name)
+
+            parent = parent + "." + name if parent else name
+
+    def update(self, keys):
+        """Add new addresses to the index.
+
+        The addresses must not be in the index already.  A few
+        addresses are inserted one by one; otherwise, they are sorted,
+        then merged with the other addresses.
+
+        """
+        if len(keys) < 32:
+            for key in keys:
+                insort(self.keys, key)
+        else:
+            self.keys.extend(sorted(keys))
+            self.keys.sort()
+
+        for key in keys:
+            self.add_namespaces(key)
+
+    def bounds(self, root=""):
+        """Return the bounds of the addresses of the namespace.
+
+        The addresses of the namespace are 'keys[start:end]'.
+
+        """
+        if not root:
+            return 0, len(self.keys)
+
+        start = bisect_left(self.keys, root + ".")
+        end = bisect_left(self.keys, root + "/", start)
+        return start, end
+
+    def prefix(self, root=""):
+        """Return the sorted addresses in the namespace."""
+        start, end = self.bounds(root)
+        return self.keys[start:end]
+
+    def count(self, root=""):
+        """Return the number of addresses in the namespace."""
+        start, end = self.bounds(root)
+        return end - start
+
+    def children(self, root=""):
+        """Return the sorted names of the direct sub-namespaces."""
+        return list(self.namespaces.get(root, ()))
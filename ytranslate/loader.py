@@ -28,6 +28,42 @@
 
 """Module containing the Loader class, described below."""
 
+from contextlib import contextmanager
+from threading import local
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+class ThreadVar(local):
+
+    """A per-thread variable, used if the 'contextvars' module is missing.
+
+    It offers the same 'get', 'set' and 'reset' methods as 'ContextVar'.
+
+    """
+
+    value = None
+
+    def get(self):
+        """Return the value for the current thread."""
+        return self.value
+
+    def set(self, value):
+        """Set the value, return the previous one as a token."""
+        token = self.value
+        self.value = value
+        return token
+
+    def reset(self, token):
+        """Restore the value of the token."""
+        self.value = token
+
+if ContextVar is not None:
+    context_catalog = ContextVar("ytranslate_catalog", default=None)
+else:
+    context_catalog = ThreadVar()
 
 class Loader(object):
 
@@ -42,6 +78,12 @@ class Loader(object):
     although it's possible to create several loaders and work with
     them simultaneously, if the need arises.
 
+    The catalog selected by 'select' is shared by all threads (it's
+    stored in 'Loader.current_catalog', whatever the loader).  The
+    'using' context manager selects a catalog for the current context
+    only (the current thread, or the current asyncio task), which
+    has priority over the catalog selected by 'select'.
+
     """
 
     current_loader = None
@@ -51,6 +93,28 @@ class Loader(object):
         """Load the catalogs."""
         raise NotImplementedError
 
+    def get_catalog(self, catalog):
+        """Return the catalog of the specified name."""
+        return self.catalogs[catalog]
+
     def select(self, catalog):
         """Select the catalog of the specified name."""
-        type(self).current_catalog = self.catalogs[catalog]
+        Loader.current_catalog = self.get_catalog(catalog)
+
+    @contextmanager
+    def using(self, catalog):
+        """Select the catalog of the specified name in this context.
+
+        This context manager selects the catalog in the current thread
+        or asyncio task only, and restores the previous selection
+        when it exits:
+            with loader.using("fr"):
+                ...
+
+        """
+        catalog = self.get_catalog(catalog)
+        token = context_catalog.set(catalog)
+        try:
+            yield catalog
+        finally:
+            context_catalog.reset(token)
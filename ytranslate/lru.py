@@ -0,0 +1,84 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the LRUCache class, described below."""
+
+from collections import OrderedDict
+
+class LRUCache(object):
+
+    """A cache of limited size, discarding the least recently used items.
+
+    The number of hits and misses is kept in the 'hits' and
+    'misses' attributes, to help choose the size of the cache.
+    The 'messages' attribute is used by catalogs to remember
+    which dictionary of messages the cached items come from.
+
+    """
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.messages = None
+
+    def __repr__(self):
+        return "<ytranslate.LRUCache ({}/{} items, {} hits, " \
+                "{} misses)>".format(len(self.data), self.size, self.hits,
+                self.misses)
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key):
+        """Return the cached value, or None."""
+        data = self.data
+        try:
+            value = data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+
+        data[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Add a value to the cache, discarding the oldest one if needed."""
+        data = self.data
+        data[key] = value
+        if len(data) > self.size:
+            try:
+                data.popitem(last=False)
+            except KeyError:
+                pass
+
+    def clear(self):
+        """Remove all the cached values."""
+        self.data.clear()
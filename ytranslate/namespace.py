@@ -0,0 +1,105 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the Namespace class, described below."""
+
+class Namespace(object):
+
+    """A namespace bound to a catalog.
+
+    A Namespace object is used to retrieve several messages sharing
+    the same namespace, without repeating it.  For instance:
+        login = catalog.bind("ui.login")
+        login.retrieve("user", name="Jean")
+        # Same as catalog.retrieve("ui.login.user", name="Jean")
+
+    The full addresses are computed once and kept in the 'addresses'
+    dictionary.  The namespace can be bound to a catalog, or to a
+    function returning a catalog (see 'ytranslate.tools.bind'), in
+    which case the catalog is resolved each time a message is
+    retrieved.
+
+    """
+
+    def __init__(self, namespace, catalog=None, resolve=None):
+        self.namespace = namespace
+        self.prefix = namespace + "." if namespace else ""
+        self.catalog = catalog
+        self.resolve = resolve
+        self.addresses = {}
+
+    def __repr__(self):
+        return "<ytranslate.Namespace {}>".format(repr(self.namespace))
+
+    def get_catalog(self):
+        """Return the bound catalog."""
+        if self.catalog is not None:
+            return self.catalog
+
+        return self.resolve()
+
+    def address(self, name):
+        """Return the full address of this name."""
+        address = self.addresses.get(name)
+        if address is None:
+            address = self.prefix + name
+            self.addresses[name] = address
+
+        return address
+
+    def retrieve(self, name, count=None, **kwargs):
+        """Retrieve a message in this namespace.
+
+        See 'Catalog.retrieve' for the meaning of the arguments.
+
+        """
+        return self.get_catalog().retrieve(self.address(name), count,
+                **kwargs)
+
+    __call__ = retrieve
+
+    def retrieve_many(self, items, **kwargs):
+        """Retrieve several messages in this namespace.
+
+        See 'Catalog.retrieve_many' for the meaning of the arguments.
+
+        """
+        address = self.address
+        addresses = []
+        for item in items:
+            if isinstance(item, tuple):
+                item = (address(item[0]), ) + item[1:]
+            else:
+                item = address(item)
+            addresses.append(item)
+
+        return self.get_catalog().retrieve_many(addresses, **kwargs)
+
+    def bind(self, namespace):
+        """Return a sub-namespace bound to the same catalog."""
+        return Namespace(self.address(namespace), self.catalog, self.resolve)
@@ -0,0 +1,123 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the Plural class, described below."""
+
+from bisect import bisect_right
+
+class Plural(object):
+
+    """A group of messages selected by a 'count' indicator.
+
+    A group of messages is defined in a catalog as a dictionary
+    whose keys are numbers ('1') or numbers followed by the '+'
+    sign ('2+').  The Plural object reads this dictionary once and
+    builds a dispatch table from it:  numbers are stored in a
+    dictionary of exact matches, while numbers followed by the '+'
+    sign are sorted as thresholds.  An exact match always has
+    priority; otherwise, the greatest threshold lower than or equal
+    to the count is selected.  Invalid keys raise a ValueError
+    when the Plural object is created.
+
+    """
+
+    __slots__ = ("address", "messages", "exact", "thresholds", "values")
+
+    def __init__(self, address, messages):
+        self.address = address
+        self.messages = messages
+        self.exact = {}
+        ranges = {}
+        for key, value in messages.items():
+            key = str(key)
+            number = key
+            target = self.exact
+            if key.endswith("+"):
+                number = key[:-1]
+                target = ranges
+
+            try:
+                if not number.isdigit():
+                    raise ValueError
+                number = int(number)
+            except ValueError:
+                raise ValueError("message {}: {} isn't a valid " \
+                        "number.".format(repr(address), key))
+
+            target[number] = value
+
+        self.thresholds = sorted(ranges.keys())
+        self.values = [ranges[number] for number in self.thresholds]
+
+    def __repr__(self):
+        return "<ytranslate.Plural {}>".format(repr(self.address))
+
+    def copy(self, address):
+        """Return the same group of messages at another address.
+
+        The dispatch table is shared, not built again.
+
+        """
+        plural = Plural.__new__(Plural)
+        plural.address = address
+        plural.messages = self.messages
+        plural.exact = self.exact
+        plural.thresholds = self.thresholds
+        plural.values = self.values
+        return plural
+
+    def select(self, count):
+        """Return the message to be used with this count."""
+        message = self.exact.get(count)
+        if message is None:
+            index = bisect_right(self.thresholds, count) - 1
+            if index >= 0:
+                message = self.values[index]
+
+        if message is None:
+            raise ValueError("address {}: no proper message " \
+                    "to be displayed with a count of {}".format(
+                    repr(self.address), count))
+
+        return message
+
+    def branch(self, count):
+        """Return the key of the message selected for this count.
+
+        The key is returned as written in the catalog ('1' or '2+').
+        If no message can be selected, return None.
+
+        """
+        if self.exact.get(count) is not None:
+            return str(count)
+
+        index = bisect_right(self.thresholds, count) - 1
+        if index >= 0 and self.values[index] is not None:
+            return "{}+".format(self.thresholds[index])
+
+        return None
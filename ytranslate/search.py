@@ -0,0 +1,252 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the SearchIndex class, described below.
+
+A search index is an inverted index of the messages of a catalog:
+each word (token) is associated with the messages containing it.
+It's used to find the addresses of the messages containing some
+words, or a phrase.  For instance:
+    index = SearchIndex(catalog.messages)
+    index.search("connection fail*")
+    index.search("connection failed", phrase=True)
+
+A search index can be written in an index file (using the 'marshal'
+module), next to the compiled catalog files.  Each index file
+stores the modification time and size of the catalog files it has
+been built from, so that an index file is ignored as soon as one
+of these files changes (see 'read_index' and 'write_index').
+
+"""
+
+from bisect import bisect_left
+from functools import partial
+import marshal
+import os
+import os.path
+import re
+import sys
+
+from ytranslate.files import write_file
+
+MAGIC = "ytranslate-index"
+VERSION = tuple(sys.version_info[:2])
+
+PLACEHOLDER = re.compile(r"\{[^{}]*\}")
+WORD = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text):
+    """Return the lowercase words of a text, ignoring placeholders."""
+    return WORD.findall(PLACEHOLDER.sub(" ", text).lower())
+
+class SearchIndex(object):
+
+    """An inverted index of the messages of a catalog.
+
+    Each message (or each message of a group selected by a count
+    indicator) is a document.  The 'vocabulary' is the sorted list
+    of tokens, and 'postings' contains, for each token, the sorted
+    identifiers of the documents containing it.  The tokens of each
+    document are kept (as identifiers), to check phrases.
+
+    """
+
+    def __init__(self, messages=None):
+        self.addresses = []
+        self.documents = []
+        self.texts = []
+        self.sequences = []
+        self.vocabulary = []
+        self.postings = []
+        if messages is not None:
+            self.build(messages)
+
+    def __repr__(self):
+        return "<ytranslate.SearchIndex ({} addresses, {} tokens)>".format(
+                len(self.addresses), len(self.vocabulary))
+
+    def build(self, messages):
+        """Build the index of the messages."""
+        documents = {}
+        sequences = []
+        for address, message in sorted(messages.items()):
+            address_id = len(self.addresses)
+            self.addresses.append(address)
+            if isinstance(message, dict):
+                texts = [text for number, text in sorted(message.items())]
+            else:
+                texts = [message]
+
+            for text in texts:
+                document = len(self.texts)
+                self.documents.append(address_id)
+                self.texts.append(text)
+                tokens = tokenize(text)
+                sequences.append(tokens)
+                for token in tokens:
+                    posting = documents.setdefault(token, [])
+                    if not posting or posting[-1] != document:
+                        posting.append(document)
+
+        self.vocabulary = sorted(documents.keys())
+        identifiers = {token: i for i, token in enumerate(self.vocabulary)}
+        self.postings = [tuple(documents[token]) for token in
+                self.vocabulary]
+        self.sequences = [tuple(identifiers[token] for token in tokens) for
+                tokens in sequences]
+
+    def find(self, token):
+        """Return the set of documents containing a token."""
+        i = bisect_left(self.vocabulary, token)
+        if i < len(self.vocabulary) and self.vocabulary[i] == token:
+            return set(self.postings[i])
+
+        return set()
+
+    def prefix(self, prefix):
+        """Return the set of documents containing a token with a prefix."""
+        documents = set()
+        vocabulary = self.vocabulary
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            documents.update(self.postings[i])
+            i += 1
+
+        return documents
+
+    def parse(self, query):
+        """Parse a query, return a list of (token, prefix) tuples.
+
+        A word followed by '*' is a prefix.
+
+        """
+        terms = []
+        for word in query.split():
+            tokens = tokenize(word)
+            for i, token in enumerate(tokens):
+                prefix = word.endswith("*") and i == len(tokens) - 1
+                terms.append((token, prefix))
+
+        return terms
+
+    def search(self, query, phrase=False):
+        """Search the messages matching a query.
+
+        By default, the messages containing every word of the query
+        are returned.  A word followed by '*' matches every word
+        beginning with it.  If 'phrase' is set, the words must appear
+        in this order, one after the other.
+
+        Return a list of (address, message) tuples, sorted by address.
+
+        """
+        terms = self.parse(query)
+        if not terms:
+            return []
+
+        documents = None
+        for token, prefix in sorted(terms, key=lambda term: term[1]):
+            found = self.prefix(token) if prefix else self.find(token)
+            documents = found if documents is None else documents & found
+            if not documents:
+                return []
+
+        if phrase and len(terms) > 1:
+            documents = [document for document in documents if
+                    self.contains(document, terms)]
+
+        return [(self.addresses[self.documents[document]],
+                self.texts[document]) for document in sorted(documents)]
+
+    def contains(self, document, terms):
+        """Return whether the document contains the phrase."""
+        vocabulary = self.vocabulary
+        tokens = [vocabulary[token] for token in self.sequences[document]]
+        for start in range(len(tokens) - len(terms) + 1):
+            for offset, (token, prefix) in enumerate(terms):
+                found = tokens[start + offset]
+                if found != token and not (prefix and found.startswith(
+                        token)):
+                    break
+            else:
+                return True
+
+        return False
+
+def sources_of(fullnames):
+    """Return the modification time and size of catalog files."""
+    sources = []
+    for fullname in sorted(fullnames):
+        stat = os.stat(fullname)
+        sources.append((fullname, stat.st_mtime, stat.st_size))
+
+    return sources
+
+def read_index(path, fullnames):
+    """Return the search index stored in an index file.
+
+    The full names are the catalog files the index has been built
+    from.  If the index file doesn't exist, cannot be read, or has
+    been built from other or older catalog files, return None.
+
+    """
+    try:
+        sources = sources_of(fullnames)
+        with open(path, "rb") as file:
+            data = marshal.load(file)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(data, tuple) or len(data) != 9:
+        return None
+
+    magic, version, stored = data[:3]
+    if magic != MAGIC or version != VERSION or \
+            [tuple(source) for source in stored] != sources:
+        return None
+
+    index = SearchIndex()
+    index.addresses, index.documents, index.texts, index.sequences, \
+            index.vocabulary, index.postings = data[3:]
+    return index
+
+def write_index(path, index, fullnames):
+    """Write a search index in an index file.
+
+    The index file is first written under a temporary name, then
+    renamed, so that an index file is never read half-written.
+
+    """
+    data = (MAGIC, VERSION, sources_of(fullnames), index.addresses,
+            index.documents, index.texts, index.sequences, index.vocabulary,
+            index.postings)
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent)
+
+    write_file(path, partial(marshal.dump, data), binary=True)
@@ -0,0 +1,234 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the instrumentation of retrieved messages.
+
+When a profile is enabled, every message retrieved by a catalog
+(and therefore by the 't' function) is recorded in this profile:
+the number of calls and misses per address, the time spent to
+retrieve, select (with a count indicator) and format the message,
+and the keys of the groups of messages selected by count indicators.
+For instance:
+    from ytranslate import stats
+    profile = stats.enable()
+    ...
+    stats.disable()
+    profile.dump("profile.json")
+
+The profile can then be displayed with the 'stats' command.  When no
+profile is enabled, retrieving a message only costs an additional
+check.
+
+This module also contains the reports of loaded catalog files (see
+'LoadReport'), created by the file system loader when profiling is
+enabled:
+    loader = FSLoader("translations", profile=True)
+    loader.load()
+    for file_report in loader.report.slowest(5):
+        ...
+
+"""
+
+import json
+
+profile = None
+
+class AddressStats(object):
+
+    """The statistics of an address."""
+
+    __slots__ = ("calls", "misses", "time", "count_time", "format_time",
+            "branches")
+
+    def __init__(self):
+        self.calls = 0
+        self.misses = 0
+        self.time = 0.0
+        self.count_time = 0.0
+        self.format_time = 0.0
+        self.branches = {}
+
+    def to_dict(self):
+        """Return the statistics as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class Profile(object):
+
+    """A profile of retrieved messages.
+
+    The 'addresses' dictionary contains the statistics of each
+    address (see 'AddressStats').
+
+    """
+
+    def __init__(self):
+        self.addresses = {}
+
+    def __repr__(self):
+        return "<ytranslate.Profile ({} addresses)>".format(
+                len(self.addresses))
+
+    def get(self, address):
+        """Return the statistics of an address, creating them if needed."""
+        stats = self.addresses.get(address)
+        if stats is None:
+            stats = AddressStats()
+            self.addresses[address] = stats
+
+        return stats
+
+    def to_dict(self):
+        """Return the profile as a dictionary."""
+        return {address: stats.to_dict() for address, stats in
+                self.addresses.items()}
+
+    def dump(self, path):
+        """Write the profile in a JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=4, sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        """Read a profile from a JSON file."""
+        with open(path, "r") as file:
+            data = json.load(file)
+
+        profile = cls()
+        for address, values in data.items():
+            stats = profile.get(address)
+            for name in AddressStats.__slots__:
+                setattr(stats, name, values.get(name, getattr(stats, name)))
+
+        return profile
+
+class FileReport(object):
+
+    """The report of a loaded catalog file.
+
+    The times (in seconds) are spent to read the file (or its compiled
+    version), parse the YAML content, flatten the parsed dictionary
+    and merge the messages in the catalogs.
+
+    """
+
+    __slots__ = ("fullname", "read", "parse", "flatten", "merge", "bytes",
+            "messages", "compiled")
+
+    def __init__(self, fullname):
+        self.fullname = fullname
+        self.read = 0.0
+        self.parse = 0.0
+        self.flatten = 0.0
+        self.merge = 0.0
+        self.bytes = 0
+        self.messages = 0
+        self.compiled = False
+
+    def __repr__(self):
+        return "<ytranslate.FileReport {} ({:.6f}s)>".format(
+                repr(self.fullname), self.total)
+
+    @property
+    def total(self):
+        """Return the total time spent on this file."""
+        return self.read + self.parse + self.flatten + self.merge
+
+    def to_dict(self):
+        """Return the report as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class LoadReport(object):
+
+    """The report of loaded catalog files.
+
+    The 'files' dictionary contains the report of each file (see
+    'FileReport').  A file loaded several times (when the loader
+    reloads it) only keeps its last report.
+
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def __repr__(self):
+        return "<ytranslate.LoadReport ({} files)>".format(len(self.files))
+
+    def add(self, file_report):
+        """Add the report of a file."""
+        self.files[file_report.fullname] = file_report
+
+    def get(self, fullname):
+        """Return the report of a file, creating it if needed."""
+        file_report = self.files.get(fullname)
+        if file_report is None:
+            file_report = FileReport(fullname)
+            self.files[fullname] = file_report
+
+        return file_report
+
+    def totals(self):
+        """Return the totals of every file as a dictionary."""
+        totals = {"files": len(self.files), "compiled": 0}
+        for name in ("read", "parse", "flatten", "merge", "total", "bytes",
+                "messages"):
+            totals[name] = 0
+
+        for file_report in self.files.values():
+            for name in ("read", "parse", "flatten", "merge", "total",
+                    "bytes", "messages"):
+                totals[name] += getattr(file_report, name)
+            if file_report.compiled:
+                totals["compiled"] += 1
+
+        return totals
+
+    def slowest(self, number=10):
+        """Return the reports of the slowest files."""
+        reports = sorted(self.files.values(),
+                key=lambda file_report: file_report.total, reverse=True)
+        return reports[:number]
+
+    def to_dict(self):
+        """Return the report as a dictionary."""
+        return {
+            "files": {fullname: file_report.to_dict() for fullname,
+                    file_report in self.files.items()},
+            "totals": self.totals(),
+        }
+
+def enable():
+    """Enable a new profile and return it."""
+    global profile
+    profile = Profile()
+    return profile
+
+def disable():
+    """Disable the current profile and return it."""
+    global profile
+    current, profile = profile, None
+    return current
@@ -0,0 +1,195 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the catalog stores, described below.
+
+A catalog store is a read-only file containing the messages of
+a catalog, designed to be mapped in memory (with the 'mmap' module).
+Processes using the same store share the same memory pages, and
+messages are read directly from these pages, without building
+a dictionary.  This is useful for servers forking several workers.
+
+A store file contains:
+
+-   A header: the magic string, the number of slots in the hash
+    table and the number of messages.
+-   A hash table of slots.  Each slot contains the CRC32 hash of an
+    address, the position and length of this address, the position
+    and length of the message, and the kind of message (string or
+    group of messages selected by a count indicator).  Collisions
+    are resolved by linear probing.
+-   The addresses and messages, encoded in UTF-8.  The messages of
+    a group are stored as keys and values separated by null bytes.
+
+"""
+
+import mmap
+import os
+import os.path
+import struct
+from zlib import crc32
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from ytranslate.files import write_file
+
+MAGIC = b"YTS1"
+HEADER = struct.Struct("<4sII")
+SLOT = struct.Struct("<IIIIII")
+
+# Kinds of slots
+EMPTY = 0
+STRING = 1
+GROUP = 2
+
+def write_store(path, messages):
+    """Write the messages in a store file.
+
+    The file is first written under a temporary name, then renamed.
+
+    """
+    nb_slots = 8
+    while nb_slots < len(messages) * 2:
+        nb_slots *= 2
+
+    slots = [None] * nb_slots
+    data = []
+    position = HEADER.size + SLOT.size * nb_slots
+    for address, message in sorted(messages.items()):
+        key = address.encode("utf-8")
+        kind = STRING
+        if isinstance(message, dict):
+            kind = GROUP
+            message = u"\0".join(u"{}\0{}".format(number, text) for
+                    number, text in sorted(message.items()))
+
+        value = message.encode("utf-8")
+        hashed = crc32(key) & 0xffffffff
+        slot = hashed % nb_slots
+        while slots[slot] is not None:
+            slot = (slot + 1) % nb_slots
+
+        slots[slot] = (hashed, position, len(key), position + len(key),
+                len(value), kind)
+        data.append(key)
+        data.append(value)
+        position += len(key) + len(value)
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    def write(file):
+        file.write(HEADER.pack(MAGIC, nb_slots, len(messages)))
+        empty = SLOT.pack(0, 0, 0, 0, 0, EMPTY)
+        for slot in slots:
+            file.write(SLOT.pack(*slot) if slot is not None else empty)
+        for chunk in data:
+            file.write(chunk)
+
+    write_file(path, write, binary=True)
+
+class MappedMessages(Mapping):
+
+    """The read-only messages of a store file mapped in memory.
+
+    This object behaves like a dictionary of messages.  Groups of
+    messages are decoded once, then kept in the 'groups' dictionary.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.nb_slots, self.size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.map.close()
+            raise ValueError("{} isn't a catalog store".format(repr(path)))
+
+        self.groups = {}
+
+    def __repr__(self):
+        return "<ytranslate.MappedMessages {}>".format(repr(self.path))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for slot in range(self.nb_slots):
+            hashed, start, length, value_start, value_length, kind = \
+                    SLOT.unpack_from(self.map, HEADER.size + slot * SLOT.size)
+            if kind != EMPTY:
+                yield self.map[start:start + length].decode("utf-8")
+
+    def __contains__(self, address):
+        return self.get(address) is not None
+
+    def __getitem__(self, address):
+        message = self.get(address)
+        if message is None:
+            raise KeyError(address)
+
+        return message
+
+    def get(self, address, default=None):
+        """Return the message at this address, or the default value."""
+        key = address.encode("utf-8")
+        hashed = crc32(key) & 0xffffffff
+        slot = hashed % self.nb_slots
+        while True:
+            stored, start, length, value_start, value_length, kind = \
+                    SLOT.unpack_from(self.map, HEADER.size + slot * SLOT.size)
+            if kind == EMPTY:
+                return default
+
+            if stored == hashed and self.map[start:start + length] == key:
+                break
+
+            slot = (slot + 1) % self.nb_slots
+
+        if kind == GROUP:
+            group = self.groups.get(value_start)
+            if group is None:
+                parts = self.map[value_start:value_start +
+                        value_length].decode("utf-8").split(u"\0")
+                group = dict(zip(parts[::2], parts[1::2]))
+                self.groups[value_start] = group
+
+            return group
+
+        return self.map[value_start:value_start + value_length].decode(
+                "utf-8")
+
+    def close(self):
+        """Close the memory map."""
+        self.map.close()
@@ -0,0 +1,71 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the StoreLoader class, described below."""
+
+import os
+import os.path
+
+from ytranslate.catalog import Catalog
+from ytranslate.loader import Loader
+from ytranslate.store import MappedMessages
+
+class StoreLoader(Loader):
+
+    """A loader of catalog stores.
+
+    This loader reads the catalog stores (see 'ytranslate.store')
+    contained in a directory.  Each store file is named after its
+    catalog, with the '.yts' extension ('en.yts' contains the 'en'
+    catalog).  These files can be created by the 'compile' command
+    with the '--store' option.
+
+    The stores are mapped in memory:  processes using the same
+    stores share their memory pages, and no dictionary of messages
+    is built.  The catalogs are read-only.
+
+    """
+
+    def __init__(self, store_dir, backend=None):
+        self.store_dir = store_dir
+        self.backend = backend
+        self.catalogs = {}
+
+    def __repr__(self):
+        return "<ytranslate.StoreLoader (store={})>".format(
+                repr(self.store_dir))
+
+    def load(self):
+        """Load the catalogs."""
+        for file in sorted(os.listdir(self.store_dir)):
+            if len(file) > 4 and file.endswith(".yts"):
+                name = file[:-4]
+                catalog = Catalog(name, self.backend)
+                catalog.messages = MappedMessages(os.path.join(
+                        self.store_dir, file))
+                self.catalogs[name] = catalog
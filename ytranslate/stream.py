@@ -0,0 +1,454 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the StreamReader and StreamWriter classes."""
+
+from yaml.composer import ComposerError
+from yaml.constructor import ConstructorError
+from yaml.events import (AliasEvent, DocumentEndEvent, DocumentStartEvent,
+        MappingEndEvent, MappingStartEvent, ScalarEvent, SequenceEndEvent,
+        SequenceStartEvent, StreamEndEvent)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+try:
+    unicode
+except NameError:
+    unicode = str
+
+MAP_TAG = "tag:yaml.org,2002:map"
+MERGE_TAG = "tag:yaml.org,2002:merge"
+
+class Frame(object):
+
+    """A mapping being read by the stream reader.
+
+    A frame stores the address of the mapping, the keys already read
+    in this mapping, the values kept while the mapping could still
+    be a group of messages selected by a count indicator, and the
+    mappings to merge (with the '<<' key).
+
+    """
+
+    __slots__ = ("address", "start_mark", "keys", "buffer", "merges")
+
+    def __init__(self, address, start_mark, buffered=True):
+        self.address = address
+        self.start_mark = start_mark
+        self.keys = set()
+        self.buffer = [] if buffered else None
+        self.merges = None
+
+class StreamReader(object):
+
+    """A reader of YAML catalogs, driven by parser events.
+
+    The 'yaml.safe_load' function builds the whole document before
+    it can be flattened by 'Catalog.read_dictionary'.  A stream
+    reader reads the YAML stream chunk by chunk instead, and
+    flattens each message as soon as it has been parsed.  Only the
+    mappings being read and the values of some entries are kept:
+
+    -   The entries of a mapping containing only numbers (like '1'
+        or '2+') are kept until the end of the mapping, since this
+        mapping could be a group of messages selected by a count
+        indicator.
+    -   Sequences, explicitly-tagged mappings, anchored and aliased
+        nodes are composed (and constructed) as a whole, then
+        flattened like 'Catalog.read_dictionary' does.
+
+    Scalars are resolved and constructed by the backend's loader,
+    so the result is the same as with 'Catalog.read_YAML'.
+
+    """
+
+    def __init__(self, catalog, stream):
+        self.catalog = catalog
+        self.stream = stream
+        self.loader = catalog.backend.loader(stream)
+        self.anchors = {}
+
+    def read(self):
+        """Read the stream, add its messages to the catalog."""
+        loader = self.loader
+        try:
+            # Skip the stream start event
+            loader.get_event()
+            if loader.check_event(StreamEndEvent):
+                self.not_a_dictionary()
+
+            document = loader.get_event()
+            if not loader.check_event(MappingStartEvent):
+                self.not_a_dictionary()
+
+            self.read_mapping(None)
+
+            # Skip the document end event
+            loader.get_event()
+            if not loader.check_event(StreamEndEvent):
+                event = loader.get_event()
+                raise ComposerError("expected a single document in the " \
+                        "stream", document.start_mark, "but found another " \
+                        "document", event.start_mark)
+        finally:
+            loader.dispose()
+
+    def not_a_dictionary(self):
+        """Raise a ValueError, the document isn't a dictionary."""
+        raise ValueError("catalog {}, the YAML content doesn't " \
+                "describe a dictionary".format(self.catalog.name))
+
+    def read_mapping(self, address):
+        """Read a mapping, flattening its entries.
+
+        The root mapping has no address.
+
+        """
+        loader = self.loader
+        event = loader.get_event()
+        frame = Frame(address, event.start_mark, buffered=address is not None)
+        while not loader.check_event(MappingEndEvent):
+            key_node = self.compose_node()
+            if key_node.tag == MERGE_TAG and isinstance(key_node, ScalarNode):
+                self.merge(frame, key_node, self.compose_node())
+                continue
+
+            key = self.construct(key_node)
+            try:
+                hash(key)
+            except TypeError:
+                raise ConstructorError("while constructing a mapping",
+                        frame.start_mark, "found unhashable key",
+                        key_node.start_mark)
+
+            if key in frame.keys:
+                self.forget(frame, key)
+
+            frame.keys.add(key)
+            if frame.buffer is not None:
+                if str(key).rstrip("+").isdigit():
+                    frame.buffer.append((key, self.construct(
+                            self.compose_node())))
+                    continue
+
+                self.flush(frame)
+
+            self.read_entry(self.join(frame.address, key))
+
+        loader.get_event()
+        self.close(frame)
+
+    def read_entry(self, address):
+        """Read the value of an entry."""
+        loader = self.loader
+        event = loader.peek_event()
+        if isinstance(event, MappingStartEvent) and event.anchor is None \
+                and event.tag in (None, "!", MAP_TAG):
+            self.read_mapping(address)
+        elif isinstance(event, ScalarEvent) and event.anchor is None:
+            value = self.construct(self.compose_node())
+            self.catalog.messages[address] = unicode(value)
+        else:
+            self.add(address, self.construct(self.compose_node()))
+
+    def add(self, address, value):
+        """Add a constructed value, as 'Catalog.read_dictionary' does."""
+        parent, name = address.rpartition(".")[::2]
+        self.catalog.read_dictionary({name: value}, parent)
+
+    def flush(self, frame):
+        """Flatten the entries kept in a mapping.
+
+        The mapping is no longer buffered:  its next entries will be
+        flattened as soon as they are read.
+
+        """
+        buffer, frame.buffer = frame.buffer, None
+        for key, value in buffer:
+            self.add(self.join(frame.address, key), value)
+
+    def merge(self, frame, key_node, value_node):
+        """Read the mappings to merge in a mapping (the '<<' key)."""
+        node = MappingNode(MAP_TAG, [(key_node, value_node)],
+                key_node.start_mark, value_node.end_mark)
+        merged = self.loader.construct_mapping(node, deep=True)
+        self.reset()
+        if frame.merges is None:
+            frame.merges = {}
+
+        frame.merges.update(merged)
+
+    def close(self, frame):
+        """Close a mapping, flattening its remaining entries."""
+        address = frame.address
+        merges = frame.merges or {}
+        if frame.buffer is not None:
+            entries = dict(merges)
+            entries.update(frame.buffer)
+            self.add(address, entries)
+        else:
+            for key, value in merges.items():
+                if key not in frame.keys:
+                    self.add(self.join(address, key), value)
+
+    def forget(self, frame, key):
+        """Forget the messages of a key defined twice in the same mapping.
+
+        As with 'yaml.safe_load', the last value replaces the first one.
+
+        """
+        if frame.buffer is not None:
+            frame.buffer = [(other, value) for other, value in frame.buffer
+                    if other != key]
+            return
+
+        address = self.join(frame.address, key)
+        prefix = address + "."
+        messages = self.catalog.messages
+        for other in [other for other in messages if other == address or \
+                other.startswith(prefix)]:
+            del messages[other]
+            self.catalog.plurals.pop(other, None)
+
+    @staticmethod
+    def join(address, key):
+        """Return the address of a key in a mapping."""
+        if address:
+            return address + "." + str(key)
+
+        return str(key)
+
+    def construct(self, node):
+        """Construct the Python object of a node."""
+        value = self.loader.construct_object(node, deep=True)
+        self.reset()
+        return value
+
+    def reset(self):
+        """Forget the objects constructed by the loader."""
+        self.loader.constructed_objects = {}
+        self.loader.recursive_objects = {}
+
+    def compose_node(self):
+        """Compose the next node from the parser events.
+
+        This method does the same as 'yaml.composer.Composer', which
+        isn't available with every backend.
+
+        """
+        loader = self.loader
+        if loader.check_event(AliasEvent):
+            event = loader.get_event()
+            anchor = event.anchor
+            if anchor not in self.anchors:
+                raise ComposerError(None, None, "found undefined alias " \
+                        "{!r}".format(anchor), event.start_mark)
+
+            return self.anchors[anchor]
+
+        event = loader.peek_event()
+        anchor = event.anchor
+        if anchor is not None and anchor in self.anchors:
+            raise ComposerError("found duplicate anchor {!r}; first " \
+                    "occurrence".format(anchor),
+                    self.anchors[anchor].start_mark, "second occurrence",
+                    event.start_mark)
+
+        if loader.check_event(ScalarEvent):
+            event = loader.get_event()
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(ScalarNode, event.value, event.implicit)
+
+            node = ScalarNode(tag, event.value, event.start_mark,
+                    event.end_mark, style=event.style)
+            if anchor is not None:
+                self.anchors[anchor] = node
+        elif loader.check_event(SequenceStartEvent):
+            event = loader.get_event()
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(SequenceNode, None, event.implicit)
+
+            node = SequenceNode(tag, [], event.start_mark, None,
+                    flow_style=event.flow_style)
+            if anchor is not None:
+                self.anchors[anchor] = node
+
+            while not loader.check_event(SequenceEndEvent):
+                node.value.append(self.compose_node())
+
+            node.end_mark = loader.get_event().end_mark
+        else:
+            event = loader.get_event()
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(MappingNode, None, event.implicit)
+
+            node = MappingNode(tag, [], event.start_mark, None,
+                    flow_style=event.flow_style)
+            if anchor is not None:
+                self.anchors[anchor] = node
+
+            while not loader.check_event(MappingEndEvent):
+                key = self.compose_node()
+                value = self.compose_node()
+                node.value.append((key, value))
+
+            node.end_mark = loader.get_event().end_mark
+
+        return node
+
+class StreamWriter(object):
+
+    """A writer of YAML catalogs, emitting events to a stream.
+
+    The 'Catalog.write_YAML' method builds the nested dictionary of
+    messages, then dumps it as a single string.  A stream writer
+    browses the sorted addresses instead, and emits the YAML events
+    of each message directly to the stream (usually an open file).
+    The output is the same as with 'Catalog.write_YAML':  addresses
+    are sorted by namespace, as the dumper sorts the keys of each
+    dictionary, and scalars are represented and tagged as the
+    dumper does.
+
+    """
+
+    def __init__(self, catalog, stream, root=""):
+        self.catalog = catalog
+        self.stream = stream
+        self.root = root
+        self.dumper = catalog.backend.dumper(stream, indent=4, width=79,
+                default_flow_style=False)
+
+    def write(self):
+        """Write the messages of the catalog to the stream."""
+        catalog = self.catalog
+        messages = catalog.messages
+        keys = catalog.keys(self.root)
+        if self.shared(keys):
+            # The dumper would use aliases, the nested content is needed
+            self.stream.write(catalog.write_YAML(self.root))
+            return
+
+        start = len(self.root) + 1 if self.root else 0
+        keys = sorted(keys, key=lambda key: key[start:].split("."))
+        dumper = self.dumper
+        try:
+            dumper.open()
+            dumper.emit(DocumentStartEvent())
+            dumper.emit(MappingStartEvent(None, MAP_TAG, True,
+                    flow_style=False))
+            opened = []
+            previous = None
+            for key in keys:
+                names = key[start:].split(".")
+                if previous is not None and len(previous) < len(names) and \
+                        names[:len(previous)] == previous:
+                    raise ValueError("catalog {}, the {} address is both " \
+                            "a message and a namespace".format(catalog.name,
+                            repr(key[:start] + ".".join(previous))))
+
+                # Close the namespaces not containing this address
+                common = 0
+                while common < len(opened) and common < len(names) - 1 and \
+                        opened[common] == names[common]:
+                    common += 1
+
+                for i in range(len(opened) - common):
+                    dumper.emit(MappingEndEvent())
+
+                del opened[common:]
+                for name in names[common:-1]:
+                    self.emit_node(dumper.represent_data(name))
+                    dumper.emit(MappingStartEvent(None, MAP_TAG, True,
+                            flow_style=False))
+                    opened.append(name)
+
+                self.emit_node(dumper.represent_data(names[-1]))
+                self.emit_node(dumper.represent_data(messages[key]))
+                dumper.represented_objects = {}
+                previous = names
+
+            for i in range(len(opened) + 1):
+                dumper.emit(MappingEndEvent())
+
+            dumper.emit(DocumentEndEvent())
+            dumper.close()
+        finally:
+            dumper.dispose()
+
+    def shared(self, keys):
+        """Return whether several addresses share the same group.
+
+        The dumper writes a group of messages shared by several
+        addresses once, then uses aliases to it.
+
+        """
+        messages = self.catalog.messages
+        groups = set()
+        for key in keys:
+            message = messages[key]
+            if isinstance(message, dict):
+                if id(message) in groups:
+                    return True
+
+                groups.add(id(message))
+
+        return False
+
+    def emit_node(self, node):
+        """Emit the events of a represented node.
+
+        This method does the same as 'yaml.serializer.Serializer',
+        for nodes without aliases.
+
+        """
+        dumper = self.dumper
+        if isinstance(node, ScalarNode):
+            detected = dumper.resolve(ScalarNode, node.value, (True, False))
+            default = dumper.resolve(ScalarNode, node.value, (False, True))
+            implicit = (node.tag == detected), (node.tag == default)
+            dumper.emit(ScalarEvent(None, node.tag, implicit, node.value,
+                    style=node.style))
+        elif isinstance(node, SequenceNode):
+            implicit = node.tag == dumper.resolve(SequenceNode, node.value,
+                    True)
+            dumper.emit(SequenceStartEvent(None, node.tag, implicit,
+                    flow_style=node.flow_style))
+            for item in node.value:
+                self.emit_node(item)
+            dumper.emit(SequenceEndEvent())
+        else:
+            implicit = node.tag == dumper.resolve(MappingNode, node.value,
+                    True)
+            dumper.emit(MappingStartEvent(None, node.tag, implicit,
+                    flow_style=node.flow_style))
+            for key, value in node.value:
+                self.emit_node(key)
+                self.emit_node(value)
+            dumper.emit(MappingEndEvent())
@@ -26,8 +26,11 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import io
 import unittest
 
+from ytranslate import stats
+from ytranslate.backend import BACKENDS
 from ytranslate.catalog import Catalog
 
 # Documents
@@ -50,6 +53,24 @@ emails:
     5+: Wow, you have {count} emails
 """.strip()
 
+STREAM_DOC = """
+base: &base
+    1: One file
+    2+: "{count} files"
+files:
+    <<: *base
+    1: A single file
+copy: *base
+menu:
+    1: First
+    quit: Quit
+    items: [file, edit]
+duplicate:
+    old: Old
+duplicate:
+    new: New
+""".strip()
+
 class TestCatalog(unittest.TestCase):
 
     """Unittest for the Catalog class.
@@ -115,3 +136,210 @@ class TestCatalog(unittest.TestCase):
                 "Wow, you have 5 emails")
         self.assertEqual(catalog.retrieve("emails", 6),
                 "Wow, you have 6 emails")
+
+    def test_retrieve_compiled(self):
+        """Test that static messages are returned without formatting."""
+        catalog = Catalog("test")
+        catalog.read_dictionary({
+            "static": "No placeholder",
+            "escaped": "Literal {{braces}}",
+            "spec": "{price:>8.2f} for {item!r}",
+            "attribute": "{user.name}",
+        })
+
+        class User(object):
+            name = "Jeanne"
+
+        self.assertEqual(catalog.retrieve("static"), "No placeholder")
+        self.assertEqual(catalog.retrieve("escaped"), "Literal {braces}")
+        self.assertEqual(catalog.retrieve("spec", price=3.5, item="tea"),
+                "{price:>8.2f} for {item!r}".format(price=3.5, item="tea"))
+        self.assertEqual(catalog.retrieve("attribute", user=User()),
+                "Jeanne")
+        self.assertRaises(KeyError, catalog.retrieve, "spec", price=1)
+
+    def test_retrieve_plural_order(self):
+        """Test that count indicators don't depend on their order."""
+        catalog = Catalog("test")
+        catalog.read_dictionary({"emails": {"5+": "many", "2+": "some",
+                "1": "one", "0": "none", "7": "seven"}})
+        self.assertEqual(catalog.retrieve("emails", 0), "none")
+        self.assertEqual(catalog.retrieve("emails", 1), "one")
+        self.assertEqual(catalog.retrieve("emails", 4), "some")
+        self.assertEqual(catalog.retrieve("emails", 6), "many")
+        self.assertEqual(catalog.retrieve("emails", 7), "seven")
+        self.assertEqual(catalog.retrieve("emails", 8), "many")
+
+    def test_invalid_plural(self):
+        """Test that invalid count indicators fail when loading."""
+        catalog = Catalog("test")
+        self.assertRaises(ValueError, catalog.read_YAML,
+                "emails:\n    1: one\n    2++: several")
+        catalog = Catalog("test")
+        catalog.read_YAML("emails:\n    2+: several")
+        self.assertRaises(ValueError, catalog.retrieve, "emails", 1)
+
+    def test_backends(self):
+        """Test that every YAML backend reads and writes the same content."""
+        written = set()
+        for name in BACKENDS:
+            catalog = Catalog("test", backend=name)
+            catalog.read_YAML(SIMPLE_DOC)
+            self.assertEqual(catalog.backend.name, name)
+            self.assertEqual(catalog.retrieve("edit"), u"Édition")
+            written.add(catalog.write_YAML())
+
+        self.assertEqual(len(written), 1)
+        self.assertRaises(ValueError, Catalog, "test", backend="unknown")
+
+    def test_namespaces(self):
+        """Test to browse the namespaces of a catalog."""
+        catalog = Catalog("test")
+        catalog.read_YAML(SIMPLE_DOC)
+        catalog.read_dictionary({"connection-state": {"up": "Up"},
+                "connection": {"dialog": {"title": "Connect"}}})
+        self.assertEqual(catalog.keys("connection"), [
+                "connection.connected", "connection.connecting",
+                "connection.dialog.title", "connection.error"])
+        self.assertEqual(catalog.list_namespaces(),
+                ["connection", "connection-state"])
+        self.assertEqual(catalog.list_namespaces("connection"), ["dialog"])
+        self.assertEqual(catalog.write_dictionary("connection.dialog"),
+                {"title": "Connect"})
+
+        self.assertEqual(catalog.count("connection"), 4)
+        self.assertEqual(catalog.items("connection.dialog"),
+                [("connection.dialog.title", "Connect")])
+
+        # Adding messages updates the index
+        index = catalog.get_index()
+        catalog.set_message("connection.proxy.host", "Host")
+        self.assertEqual(catalog.list_namespaces("connection"),
+                ["dialog", "proxy"])
+        catalog.read_dictionary({"ui": {"title": "Title"}})
+        other = Catalog("other")
+        other.read_dictionary({"error": "Error", "info": "Info"})
+        catalog.copy_from(other, "ui.dialog")
+        self.assertIs(catalog.get_index(), index)
+        self.assertEqual(catalog.list_namespaces(),
+                ["connection", "connection-state", "ui"])
+        self.assertEqual(catalog.keys("ui"), ["ui.dialog.error",
+                "ui.dialog.info", "ui.title"])
+        self.assertEqual(catalog.count(), len(catalog.messages))
+
+        # Removing messages clears the index
+        catalog.remove_message("ui.dialog.info")
+        self.assertEqual(catalog.keys("ui"), ["ui.dialog.error",
+                "ui.title"])
+        del catalog.messages["ui.title"]
+        catalog.messages["ui.quit"] = "Quit"
+        catalog.clear_index()
+        self.assertEqual(catalog.write_dictionary("ui"),
+                {"dialog": {"error": "Error"}, "quit": "Quit"})
+        self.assertRaises(ValueError, catalog.remove_message, "ui.title")
+
+    def test_cache(self):
+        """Test the cache of rendered messages."""
+        catalog = Catalog("test")
+        catalog.read_YAML(SIMPLE_DOC)
+        catalog.read_YAML(PLURAL_DOC)
+        catalog.enable_cache(size=2)
+        cache = catalog.cache
+        self.assertEqual(catalog.retrieve("greeting", name="Jeanne"),
+                "Bienvenue, Jeanne !")
+        self.assertEqual(catalog.retrieve("greeting", name="Jeanne"),
+                "Bienvenue, Jeanne !")
+        self.assertEqual(catalog.retrieve("emails", 3),
+                "You only have 3 emails")
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+
+        # The least recently used message is discarded
+        catalog.retrieve("view")
+        self.assertEqual(len(cache), 2)
+        catalog.retrieve("greeting", name="Jeanne")
+        self.assertEqual(cache.misses, 4)
+
+        # Unhashable placeholders aren't cached
+        self.assertEqual(catalog.retrieve("greeting", name=["J"]),
+                "Bienvenue, ['J'] !")
+
+        # Equal placeholders of different types aren't confused
+        self.assertEqual(catalog.retrieve("greeting", name=1),
+                "Bienvenue, 1 !")
+        self.assertEqual(catalog.retrieve("greeting", name=1.0),
+                "Bienvenue, 1.0 !")
+        self.assertEqual(catalog.retrieve("greeting", name=True),
+                "Bienvenue, True !")
+
+        # Modifying the messages clears the cache
+        catalog.set_message("greeting", u"Salut, {name} !")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(catalog.retrieve("greeting", name="Jeanne"),
+                "Salut, Jeanne !")
+        catalog.messages = {"greeting": u"Bonjour, {name} !"}
+        self.assertEqual(catalog.retrieve("greeting", name="Jeanne"),
+                "Bonjour, Jeanne !")
+
+    def test_profile(self):
+        """Test to record retrieved messages in a profile."""
+        catalog = Catalog("test")
+        catalog.read_YAML(SIMPLE_DOC)
+        catalog.read_YAML(PLURAL_DOC)
+        profile = stats.enable()
+        try:
+            catalog.retrieve("view")
+            catalog.retrieve("emails", 1)
+            catalog.retrieve("emails", 3)
+            catalog.retrieve("emails", 4)
+            self.assertRaises(ValueError, catalog.retrieve, "unknown")
+        finally:
+            self.assertIs(stats.disable(), profile)
+
+        catalog.retrieve("view")
+        self.assertEqual(sorted(profile.addresses),
+                ["emails", "unknown", "view"])
+        emails = profile.addresses["emails"]
+        self.assertEqual(emails.calls, 3)
+        self.assertEqual(emails.branches, {"1": 1, "2+": 2})
+        self.assertEqual(profile.addresses["view"].calls, 1)
+        self.assertEqual(profile.addresses["unknown"].misses, 1)
+
+    def test_read_stream(self):
+        """Test to read a YAML stream, as 'read_YAML' would."""
+        for name in BACKENDS:
+            for document in (SIMPLE_DOC, PLURAL_DOC, STREAM_DOC):
+                expected = Catalog("test", backend=name)
+                expected.read_YAML(document)
+                catalog = Catalog("test", backend=name)
+                catalog.read_stream(io.StringIO(document))
+                self.assertEqual(catalog.messages, expected.messages)
+                self.assertEqual(sorted(catalog.plurals),
+                        sorted(expected.plurals))
+
+            catalog = Catalog("test", backend=name)
+            catalog.read_stream(io.StringIO(STREAM_DOC))
+            self.assertEqual(catalog.retrieve("files", 1), u"A single file")
+            self.assertEqual(catalog.retrieve("copy", 3), u"3 files")
+            self.assertEqual(catalog.retrieve("menu.1"), u"First")
+            self.assertNotIn("duplicate.old", catalog.messages)
+            self.assertRaises(ValueError, catalog.read_stream,
+                    io.StringIO(u"- file\n- edit"))
+            self.assertRaises(ValueError, catalog.read_stream,
+                    io.StringIO(u"file: [Fichier"))
+
+    def test_write_stream(self):
+        """Test to write a YAML stream, as 'write_YAML' would."""
+        for name in BACKENDS:
+            catalog = Catalog("test", backend=name)
+            catalog.read_YAML(SIMPLE_DOC)
+            catalog.read_YAML(PLURAL_DOC)
+            catalog.set_message("connection-error", u"Erreur: 12")
+            catalog.set_message("connection.status.code", u"12")
+            for root in ("", "connection"):
+                stream = io.StringIO()
+                catalog.write_stream(stream, root)
+                self.assertEqual(stream.getvalue(), catalog.write_YAML(root))
+
+            stream = io.StringIO()
+            Catalog("empty", backend=name).write_stream(stream)
+            self.assertEqual(stream.getvalue(), u"{}\n")
@@ -0,0 +1,88 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from ytranslate.backend import BACKENDS
+from ytranslate.check import check
+from ytranslate.tests.tree import TreeTestCase
+
+class TestCheck(TreeTestCase):
+
+    """Unittest for the validation of catalog files.
+
+    These tests use a temporary directory containing catalog files
+    with problems.
+
+    """
+
+    def setUp(self):
+        TreeTestCase.setUp(self)
+        self.write("en/ui.yml", "greeting: Hello, {name}!\nquit: Quit\n" \
+                "emails:\n    1: One email\n    2+: '{count} emails'\n")
+        self.write("fr/ui.yml", "greeting: Bonjour, {user} !\n" \
+                "quit: Quitter\nquit: Sortir\n" \
+                "emails:\n    1: Un courriel\n    2++: '{count} courriels'\n")
+        self.write("de/ui.yml", "greeting: Hallo, {name}!\nquit: [Ende\n")
+
+    def test_check(self):
+        """Test to find the problems of catalog files."""
+        problems = check(self.root_dir)
+        found = [(os.path.relpath(problem.fullname, self.root_dir),
+                problem.line) for problem in problems]
+        self.assertEqual(found, [
+                (os.path.join("de", "ui.yml"), 3),
+                (os.path.join("fr", "ui.yml"), 1),
+                (os.path.join("fr", "ui.yml"), 3),
+                (os.path.join("fr", "ui.yml"), 6),
+        ])
+        self.assertIn("missing {name}, extra {user}", problems[1].message)
+        self.assertIn("defined twice", problems[2].message)
+
+        # The same problems are found in parallel
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual([str(problem) for problem in check(
+                    self.root_dir, executor=executor)],
+                    [str(problem) for problem in problems])
+
+        self.write("fr/ui.yml", "greeting: Bonjour, {name} !\n")
+        self.write("de/ui.yml", "greeting: Hallo, {name}!\n")
+        self.assertEqual(check(self.root_dir), [])
+
+    def test_control_character(self):
+        """Test that invalid characters are reported with their line."""
+        self.write("fr/ui.yml", "greeting: Bonjour, {name} !\n" \
+                "quit: Quit\x07ter\n")
+        self.write("de/ui.yml", "greeting: Hallo, {name}!\n")
+        for backend in sorted(BACKENDS):
+            problems = check(self.root_dir, backend=backend)
+            self.assertEqual([(os.path.relpath(problem.fullname,
+                    self.root_dir), problem.line) for problem in problems],
+                    [(os.path.join("fr", "ui.yml"), 2)])
+            self.assertIn("cannot parse", problems[0].message)
@@ -0,0 +1,75 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+
+from ytranslate.compiler import compile_file, compiled_path, read_compiled
+from ytranslate.fsloader import FSLoader
+from ytranslate.tests.tree import TreeTestCase
+
+class TestCompiler(TreeTestCase):
+
+    """Unittest for the compiled catalog files.
+
+    These tests use a temporary directory, since compiled files
+    are checked against the modification time and size of
+    the catalog files.
+
+    """
+
+    def setUp(self):
+        TreeTestCase.setUp(self)
+        self.fullname = self.write("en.yml",
+                "title: Ytranslator\nemails:\n    1: one\n    2+: many")
+
+    def test_compile(self):
+        """Test to compile and read a catalog file."""
+        path = compiled_path(self.fullname, self.root_dir, self.root_dir)
+        self.assertEqual(path, self.fullname + "c")
+        self.assertEqual(compile_file(self.fullname, path), 2)
+        self.assertEqual(read_compiled(path, self.fullname), {
+            "title": "Ytranslator",
+            "emails": {"1": "one", "2+": "many"},
+        })
+
+        # Modifying the catalog file makes the compiled file obsolete
+        self.write("en.yml", "title: Ytraducteur")
+        self.assertIsNone(read_compiled(path, self.fullname))
+
+    def test_load(self):
+        """Test to load catalogs using a cache directory."""
+        cache_dir = os.path.join(self.root_dir, "cache")
+        loader = FSLoader(self.root_dir, cache_dir=cache_dir)
+        loader.load()
+        self.assertTrue(os.path.exists(os.path.join(cache_dir, "en.ymlc")))
+
+        loader = FSLoader(self.root_dir, cache_dir=cache_dir)
+        loader.load()
+        en = loader.catalogs["en"]
+        self.assertEqual(en.retrieve("title"), "Ytranslator")
+        self.assertEqual(en.retrieve("emails", 3), "many")
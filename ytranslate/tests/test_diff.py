@@ -0,0 +1,83 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from ytranslate.catalog import Catalog
+from ytranslate.diff import diff, placeholders
+
+MODEL_DOC = """
+greeting: Hello, {user.name}!
+quit: Quit
+new: New
+emails:
+    0: No email
+    1: One email
+    2+: "{count} emails"
+""".strip()
+
+CATALOG_DOC = """
+greeting: Bonjour, {name} !
+quit: Quitter
+old: Ancien
+emails:
+    1: Un courriel
+    2+: "{count} courriels"
+""".strip()
+
+class TestDiff(unittest.TestCase):
+
+    """Unittest for the diff engine."""
+
+    def test_placeholders(self):
+        """Test to find the placeholders of a message."""
+        self.assertEqual(placeholders(u"Quit"), set())
+        self.assertEqual(placeholders(u"{user.name} has {count:>3} {0}"),
+                {"user", "count", "0"})
+        self.assertEqual(placeholders(u"{{escaped}} {invalid"), set())
+        self.assertEqual(placeholders({"1": u"One", "2+": u"{count}"}),
+                {"count"})
+
+    def test_diff(self):
+        """Test to compare a catalog with its model."""
+        model = Catalog("en")
+        model.read_YAML(MODEL_DOC)
+        catalog = Catalog("fr")
+        catalog.read_YAML(CATALOG_DOC)
+        result = diff(catalog, model)
+        self.assertTrue(result)
+        self.assertEqual(result.missing, ["new"])
+        self.assertEqual(result.obsolete, ["old"])
+        self.assertEqual(result.placeholders,
+                {"greeting": ({"user"}, {"name"})})
+        self.assertEqual(result.plurals,
+                {"emails": (["0", "1", "2+"], ["1", "2+"])})
+        data = result.to_dict()
+        self.assertEqual(data["placeholders"]["greeting"],
+                {"missing": ["user"], "extra": ["name"]})
+        self.assertFalse(diff(model, model))
@@ -195,3 +195,296 @@ class TestFSLoader(unittest.TestCase):
             self.assertEqual(fr.retrieve("ui.window.buttons.quit"), u"Quitter")
             self.assertEqual(fr.retrieve("ui.errors.syntax"),
                     u"erreur de syntaxe")
+
+    @mock.patch.object(fs_os, "walk")
+    def test_lazy(self, mock_walk):
+        """Test the lazy loading of catalog files.
+
+        In lazy mode, the files are only indexed when the catalogs are
+        loaded.  A file is read when one of its addresses is
+        retrieved, or when its catalog is selected.
+
+        """
+        directories = [
+            ["example", ["en", "fr"], []],
+            ["example/en", ["ui"], []],
+            ["example/en/ui", [], ["window.yml", "errors.yml"]],
+            ["example/fr", ["ui"], []],
+            ["example/fr/ui", [], ["window.yml", "errors.yml"]],
+        ]
+
+        for i, elt in enumerate(directories):
+            directories[i][0] = elt[0].replace("/", os.sep)
+
+        self.files = {
+                "example/en/ui/window.yml": "title: Ytranslator",
+                "example/en/ui/errors.yml": "syntax: syntax error",
+                "example/fr/ui/window.yml": "title: Ytraducteur",
+                "example/fr/ui/errors.yml": "syntax: erreur de syntaxe",
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = directories
+
+            loader = FSLoader("unknown", lazy=True)
+            loader.load()
+            self.assertEqual(mock_open.call_count, 0)
+            self.assertEqual(sorted(loader.catalogs), ["en", "fr"])
+
+            # Retrieving a message only reads the file of its namespace
+            en = loader.catalogs["en"]
+            self.assertEqual(en.retrieve("ui.window.title"), u"Ytranslator")
+            self.assertEqual(mock_open.call_count, 1)
+            self.assertRaises(ValueError, en.retrieve, "ui.window.unknown")
+            self.assertEqual(mock_open.call_count, 1)
+
+            # Selecting a catalog reads all its files
+            loader.select("fr")
+            self.assertEqual(mock_open.call_count, 3)
+            self.assertEqual(loader.catalogs["fr"].messages, {
+                "ui.window.title": u"Ytraducteur",
+                "ui.errors.syntax": u"erreur de syntaxe",
+            })
+
+    @mock.patch.object(fs_os, "walk")
+    def test_executor(self, mock_walk):
+        """Test to parse the catalog files with an executor.
+
+        The files are parsed by the executor, but merged in the
+        order of the directory structure, so that conflicting
+        addresses are resolved as without an executor.
+
+        """
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            self.skipTest("the 'concurrent.futures' module is missing")
+
+        self.files = {
+                "test/en.yml": dedent("""\
+                        ui:
+                            title: Ytranslator
+                            quit: Quit"""),
+                "test/en/ui.yml": dedent("""\
+                        title: Ytranslator (overridden)"""),
+                "test/fr.yml": dedent("""\
+                        ui: {title: Ytraducteur"""),
+                "test/de.yml": dedent("""\
+                        ui: Ytranslator
+                            title: Titel"""),
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = [
+                ["test", ["en"], ["en.yml"]],
+                ["test/en", [], ["ui.yml"]],
+            ]
+
+            with ThreadPoolExecutor(2) as executor:
+                loader = FSLoader("unknown", executor=executor)
+                loader.load()
+
+            en = loader.catalogs["en"]
+            self.assertEqual(en.retrieve("ui.title"),
+                    u"Ytranslator (overridden)")
+            self.assertEqual(en.retrieve("ui.quit"), u"Quit")
+
+            # Parse errors contain the name of the file
+            mock_walk.return_value = [
+                ["test", [], ["en.yml", "fr.yml"]],
+            ]
+            with ThreadPoolExecutor(2) as executor:
+                loader = FSLoader("unknown", executor=executor)
+                with self.assertRaises(ValueError) as context:
+                    loader.load()
+
+            self.assertIn("fr.yml", str(context.exception))
+
+            # Scanner errors are reported the same way
+            mock_walk.return_value = [
+                ["test", [], ["en.yml", "de.yml"]],
+            ]
+            with ThreadPoolExecutor(2) as executor:
+                loader = FSLoader("unknown", executor=executor)
+                with self.assertRaises(ValueError) as context:
+                    loader.load()
+
+            self.assertIn("de.yml", str(context.exception))
+
+    @mock.patch.object(fs_os, "walk")
+    def test_fallbacks(self, mock_walk):
+        """Test the merged views of catalogs with fallbacks."""
+        self.files = {
+                "test/en.yml": dedent("""\
+                        new: New
+                        view: View
+                        quit: Quit"""),
+                "test/fr.yml": dedent("""\
+                        new: Nouveau
+                        view: Affichage"""),
+                "test/fr-CA.yml": dedent("""\
+                        new: Nouveau (CA)"""),
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = [
+                ["test", [], ["en.yml", "fr.yml", "fr-CA.yml"]],
+            ]
+
+            loader = FSLoader("unknown", fallbacks={"fr-CA": ["fr", "en"]})
+            loader.load()
+
+            view = loader.get_catalog("fr-CA")
+            self.assertIs(view, loader.views["fr-CA"])
+            self.assertEqual(view.retrieve("new"), u"Nouveau (CA)")
+            self.assertEqual(view.retrieve("view"), u"Affichage")
+            self.assertEqual(view.retrieve("quit"), u"Quit")
+            self.assertEqual(view.origin("new"), "fr-CA")
+            self.assertEqual(view.origin("view"), "fr")
+            self.assertEqual(view.origin("quit"), "en")
+            self.assertIsNone(view.origin("unknown"))
+
+            # The catalogs themselves are left untouched
+            self.assertEqual(loader.catalogs["fr-CA"].messages,
+                    {"new": u"Nouveau (CA)"})
+
+    @mock.patch.object(fs_os, "walk")
+    def test_compact(self, mock_walk):
+        """Test to load catalogs in compact mode."""
+        self.files = {
+                "test/en.yml": dedent("""\
+                        new: New
+                        emails:
+                            1: One email
+                            2+: "{count} emails\""""),
+                "test/fr.yml": dedent("""\
+                        new: Nouveau
+                        view: Affichage"""),
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = [
+                ["test", [], ["en.yml", "fr.yml"]],
+            ]
+
+            loader = FSLoader("unknown", compact=True)
+            loader.load()
+
+            en = loader.catalogs["en"]
+            fr = loader.catalogs["fr"]
+            self.assertEqual(len(loader.table), 3)
+            self.assertEqual(dict(en.messages), {"new": u"New",
+                    "emails": {"1": u"One email", "2+": u"{count} emails"}})
+            self.assertEqual(en.retrieve("emails", 3), u"3 emails")
+            self.assertEqual(fr.retrieve("view"), u"Affichage")
+            self.assertNotIn("view", en.messages)
+            self.assertRaises(ValueError, en.retrieve, "view")
+            self.assertRaises(ValueError, loader.update_catalog, "fr", "en")
+
+    @mock.patch.object(fs_os, "walk")
+    def test_profile(self, mock_walk):
+        """Test to record the time spent to load the catalog files."""
+        self.files = {
+                "test/en.yml": dedent("""\
+                        new: New
+                        emails:
+                            1: One email
+                            2+: "{count} emails\""""),
+                "test/fr.yml": dedent("""\
+                        new: Nouveau"""),
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = [
+                ["test", [], ["en.yml", "fr.yml"]],
+            ]
+
+            loader = FSLoader("unknown", profile=True)
+            loader.load()
+
+            report = loader.report
+            self.assertEqual(len(report.files), 2)
+            en = report.files[os.path.join("test", "en.yml")]
+            self.assertEqual(en.messages, 2)
+            self.assertEqual(en.bytes, len(self.files["test/en.yml"]))
+            self.assertFalse(en.compiled)
+            self.assertGreater(en.total, 0)
+            totals = report.totals()
+            self.assertEqual(totals["files"], 2)
+            self.assertEqual(totals["messages"], 3)
+            self.assertEqual(len(report.slowest(1)), 1)
+            self.assertIsNone(FSLoader("unknown").report)
+
+    @mock.patch.object(fs_os, "walk")
+    def test_stream(self, mock_walk):
+        """Test to load catalogs in stream mode."""
+        self.files = {
+                "test/en.yml": dedent("""\
+                        new: New
+                        emails:
+                            1: One email
+                            2+: "{count} emails\""""),
+                "test/fr/ui.yml": dedent("""\
+                        new: Nouveau
+                        view: Affichage"""),
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = [
+                ["test", ["fr"], ["en.yml"]],
+                [os.path.join("test", "fr"), [], ["ui.yml"]],
+            ]
+
+            loader = FSLoader("test", stream=True)
+            loader.load()
+
+            en = loader.catalogs["en"]
+            fr = loader.catalogs["fr"]
+            self.assertEqual(en.retrieve("new"), u"New")
+            self.assertEqual(en.retrieve("emails", 2), u"2 emails")
+            self.assertEqual(fr.retrieve("ui.view"), u"Affichage")
+
+    @mock.patch.object(fs_os, "walk")
+    def test_plurals(self, mock_walk):
+        """Test that groups of messages are compiled once, when loaded."""
+        self.files = {
+                "test/en.yml": dedent("""\
+                        emails:
+                            1: One email
+                            2+: "{count} emails\""""),
+                "test/fr/ui.yml": dedent("""\
+                        emails:
+                            1: Un courriel
+                            2+: "{count} courriels\""""),
+        }
+
+        with self.open() as mock_open:
+            mock_open.side_effect = self.mock_open
+            mock_walk.return_value = [
+                ["test", ["fr"], ["en.yml"]],
+                [os.path.join("test", "fr"), [], ["ui.yml"]],
+            ]
+
+            for stream in (False, True):
+                loader = FSLoader("test", stream=stream,
+                        fallbacks={"fr": ["en"]})
+                loader.load()
+                en = loader.catalogs["en"]
+                fr = loader.catalogs["fr"]
+                plural = fr.plurals["ui.emails"]
+                self.assertEqual(plural.address, "ui.emails")
+                self.assertEqual(fr.retrieve("ui.emails", 2),
+                        u"2 courriels")
+                self.assertIs(fr.plurals["ui.emails"], plural)
+
+                # Views share the groups of their catalogs
+                view = loader.get_catalog("fr")
+                self.assertIs(view.plurals["emails"], en.plurals["emails"])
+                self.assertEqual(view.retrieve("emails", 1), u"One email")
+                self.assertIs(view.plurals["emails"], en.plurals["emails"])
@@ -0,0 +1,103 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+
+from ytranslate.fsloader import FSLoader
+from ytranslate.tests.tree import TreeTestCase
+
+class TestReload(TreeTestCase):
+
+    """Unittest for the reloading of modified catalog files.
+
+    These tests use a temporary directory, since modified files
+    are detected using their modification time and size.
+
+    """
+
+    def setUp(self):
+        TreeTestCase.setUp(self)
+        self.write("en/ui/window.yml", "title: Ytranslator\nquit: Quit")
+        self.write("en/ui/errors.yml", "syntax: syntax error")
+        self.write("fr/ui/window.yml", "title: Ytraducteur")
+
+    def test_reload(self):
+        """Test to reload modified, added and deleted files."""
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        en = loader.catalogs["en"]
+        self.assertEqual(loader.reload(), ([], [], []))
+
+        window = self.write("en/ui/window.yml", "title: Ytranslate")
+        menu = self.write("en/ui/menu.yml", "file: File")
+        errors = self.path("en/ui/errors.yml")
+        os.remove(errors)
+        self.assertEqual(loader.reload(), ([window], [menu], [errors]))
+        self.assertIs(loader.catalogs["en"], en)
+        self.assertEqual(en.messages, {
+            "ui.window.title": "Ytranslate",
+            "ui.menu.file": "File",
+        })
+        self.assertEqual(loader.catalogs["fr"].retrieve("ui.window.title"),
+                "Ytraducteur")
+
+    def test_reload_deleted_namespace(self):
+        """Test that a file deleted in one catalog only doesn't lose edits."""
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        en = loader.catalogs["en"]
+        fr = self.path("fr/ui/window.yml")
+        os.remove(fr)
+        self.assertEqual(loader.reload(), ([], [], [fr]))
+        en.set_message("ui.window.help", "Help")
+        window = self.path("en/ui/window.yml")
+        self.assertEqual(loader.save_catalog(en, dirty=True), [window])
+        with open(window) as file:
+            self.assertIn("help: Help", file.read())
+
+    def test_reload_error(self):
+        """Test that catalogs are left untouched if a file is invalid."""
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        messages = loader.catalogs["en"].messages
+        self.write("en/ui/window.yml", "title: {Ytranslate")
+        self.write("en/ui/menu.yml", "file: File")
+        self.assertRaises(ValueError, loader.reload)
+        self.assertIs(loader.catalogs["en"].messages, messages)
+
+    def test_reload_lazy(self):
+        """Test to reload a lazy loader."""
+        loader = FSLoader(self.root_dir, lazy=True)
+        loader.load()
+        en = loader.catalogs["en"]
+        self.assertEqual(en.retrieve("ui.window.title"), "Ytranslator")
+        window = self.write("en/ui/window.yml", "title: Ytranslate")
+        self.write("en/ui/menu.yml", "file: File")
+        self.assertEqual(loader.reload(), ([window], [], []))
+        self.assertEqual(en.retrieve("ui.window.title"), "Ytranslate")
+        self.assertEqual(en.retrieve("ui.menu.file"), "File")
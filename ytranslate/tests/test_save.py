@@ -0,0 +1,110 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from ytranslate.fsloader import FSLoader
+from ytranslate.tests.tree import TreeTestCase
+
+class TestSave(TreeTestCase):
+
+    """Unittest for the saving of catalogs.
+
+    These tests use a temporary directory, to check which catalog
+    files are written.
+
+    """
+
+    def setUp(self):
+        TreeTestCase.setUp(self)
+        self.write("en/ui/window.yml", "title: Ytranslator\nquit: Quit\n")
+        self.write("en/ui/errors.yml", "syntax: syntax error\n")
+        self.write("fr/ui/window.yml", "quit: Quitter\ntitle: Ytraducteur\n")
+        self.write("fr/ui/errors.yml", "syntax: erreur de syntaxe\n")
+
+    def test_update(self):
+        """Test that only the modified namespaces are written."""
+        self.write("en/ui/errors.yml", "syntax: syntax error\nio: I/O error")
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        fr = loader.catalogs["fr"]
+        self.assertEqual(loader.update_catalog("fr", "en"), 1)
+        self.assertEqual(self.read("fr/ui/errors.yml"),
+                "io: ???\nsyntax: erreur de syntaxe\n")
+
+        # The other file hasn't been rewritten
+        self.assertEqual(self.read("fr/ui/window.yml"),
+                "quit: Quitter\ntitle: Ytraducteur\n")
+        self.assertEqual(fr.dirty, set())
+        self.assertEqual(loader.save_catalog(fr, dirty=True), [])
+        self.assertEqual(sorted(os.listdir(self.path("fr/ui"))),
+                ["errors.yml", "window.yml"])
+
+    def test_save_unrecorded(self):
+        """Test that messages modified without 'set_message' are saved."""
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        fr = loader.catalogs["fr"]
+        fr.read_YAML("ui:\n    window:\n        title: Traducteur\n")
+        fr.messages["ui.errors.syntax"] = "syntaxe"
+        self.assertEqual(fr.dirty, set())
+        self.assertEqual(loader.save_catalog(fr), [
+                self.path("fr/ui/errors.yml"),
+                self.path("fr/ui/window.yml")])
+        self.assertEqual(self.read("fr/ui/window.yml"),
+                "quit: Quitter\ntitle: Traducteur\n")
+        self.assertEqual(self.read("fr/ui/errors.yml"), "syntax: syntaxe\n")
+
+    def test_create(self):
+        """Test to create a new catalog from a model."""
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        self.assertEqual(loader.update_catalog("de", "en"), 3)
+        self.assertEqual(self.read("de/ui/window.yml"),
+                "quit: ???\ntitle: ???\n")
+        self.assertEqual(self.read("de/ui/errors.yml"), "syntax: ???\n")
+
+    def test_update_several(self):
+        """Test to update several catalogs at once."""
+        self.write("en/ui/errors.yml", "syntax: syntax error\nio: I/O error")
+        loader = FSLoader(self.root_dir)
+        loader.load()
+        with ThreadPoolExecutor(2) as executor:
+            updated = loader.update_catalogs(["fr", "de"], "en",
+                    executor=executor)
+
+        self.assertEqual(updated, {"fr": 1, "de": 4})
+        self.assertEqual(self.read("fr/ui/errors.yml"),
+                "io: ???\nsyntax: erreur de syntaxe\n")
+        self.assertEqual(self.read("de/ui/window.yml"),
+                "quit: ???\ntitle: ???\n")
+        self.assertEqual(self.read("fr/ui/window.yml"),
+                "quit: Quitter\ntitle: Ytraducteur\n")
+        self.assertEqual(loader.update_catalogs(["fr", "de"], "en"),
+                {"fr": 0, "de": 0})
@@ -0,0 +1,103 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ytranslate.catalog import Catalog
+from ytranslate.search import SearchIndex, read_index, tokenize, write_index
+
+SEARCH_DOC = """
+connection:
+    failed: The connection failed
+    lost: Connection lost, {user} is offline
+    failure: Connection failure
+emails:
+    1: One email
+    2+: "{count} emails"
+""".strip()
+
+class TestSearch(unittest.TestCase):
+
+    """Unittest for the search index."""
+
+    def setUp(self):
+        self.catalog = Catalog("en")
+        self.catalog.read_YAML(SEARCH_DOC)
+        self.index = SearchIndex(self.catalog.messages)
+
+    def addresses(self, query, phrase=False):
+        """Return the addresses of the messages matching a query."""
+        return [address for address, message in self.index.search(query,
+                phrase=phrase)]
+
+    def test_tokenize(self):
+        """Test to split a message in words."""
+        self.assertEqual(tokenize(u"Connection lost, {user} is offline"),
+                ["connection", "lost", "is", "offline"])
+
+    def test_search(self):
+        """Test to search words, prefixes and phrases."""
+        self.assertEqual(self.addresses("connection"), ["connection.failed",
+                "connection.failure", "connection.lost"])
+        self.assertEqual(self.addresses("CONNECTION failed"),
+                ["connection.failed"])
+        self.assertEqual(self.addresses("fail*"), ["connection.failed",
+                "connection.failure"])
+        self.assertEqual(self.addresses("user"), [])
+        self.assertEqual(self.index.search("emails"),
+                [("emails", u"{count} emails")])
+        self.assertEqual(self.addresses("connection failed", phrase=True),
+                ["connection.failed"])
+        self.assertEqual(self.addresses("failed connection", phrase=True),
+                [])
+        self.assertEqual(self.addresses("connection fail*", phrase=True),
+                ["connection.failed", "connection.failure"])
+
+    def test_persistence(self):
+        """Test to write and read an index file."""
+        directory = tempfile.mkdtemp()
+        try:
+            fullname = os.path.join(directory, "en.yml")
+            with open(fullname, "w") as file:
+                file.write(SEARCH_DOC)
+
+            path = os.path.join(directory, "cache", "en.yti")
+            self.assertIsNone(read_index(path, [fullname]))
+            write_index(path, self.index, [fullname])
+            index = read_index(path, [fullname])
+            self.assertEqual(index.search("lost"), self.index.search("lost"))
+
+            # The index is ignored once the catalog file changes
+            with open(fullname, "a") as file:
+                file.write("\nquit: Quit")
+            self.assertIsNone(read_index(path, [fullname]))
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,98 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ytranslate.store import MappedMessages, write_store
+from ytranslate.loader import Loader
+from ytranslate.storeloader import StoreLoader
+from ytranslate.tools import init, select, t
+
+class TestStore(unittest.TestCase):
+
+    """Unittest for the catalog stores.
+
+    These tests use a temporary directory to write store files.
+
+    """
+
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir)
+
+    def test_store(self):
+        """Test to write and read a store file."""
+        messages = {"address{}".format(i): u"Message {} é".format(i)
+                for i in range(100)}
+        messages["emails"] = {"0": u"No email", "2+": u"{count} emails"}
+        path = os.path.join(self.store_dir, "en.yts")
+        write_store(path, messages)
+        mapped = MappedMessages(path)
+        try:
+            self.assertEqual(len(mapped), 101)
+            self.assertEqual(dict(mapped), messages)
+            self.assertEqual(mapped.get("address42"), u"Message 42 é")
+            self.assertIs(mapped["emails"], mapped["emails"])
+            self.assertIsNone(mapped.get("unknown"))
+            self.assertNotIn("unknown", mapped)
+        finally:
+            mapped.close()
+
+    def test_loader(self):
+        """Test to load catalogs from store files."""
+        write_store(os.path.join(self.store_dir, "en.yts"),
+                {"ui.title": u"Ytranslator"})
+        write_store(os.path.join(self.store_dir, "fr.yts"),
+                {"ui.title": u"Ytraducteur"})
+        loader = StoreLoader(self.store_dir)
+        loader.load()
+        self.assertEqual(sorted(loader.catalogs), ["en", "fr"])
+        self.assertEqual(loader.catalogs["fr"].retrieve("ui.title"),
+                u"Ytraducteur")
+        for catalog in loader.catalogs.values():
+            catalog.messages.close()
+
+    def test_tools(self):
+        """Test to select a store catalog with 'ytranslate.tools'."""
+        write_store(os.path.join(self.store_dir, "en.yts"),
+                {"ui.title": u"Ytranslator"})
+        init(StoreLoader, store_dir=self.store_dir)
+        loader = Loader.current_loader
+        try:
+            select("en")
+            self.assertEqual(t("ui.title"), u"Ytranslator")
+        finally:
+            Loader.current_loader = None
+            Loader.current_catalog = None
+            for catalog in loader.catalogs.values():
+                catalog.messages.close()
@@ -0,0 +1,110 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+import unittest
+
+from ytranslate.catalog import Catalog
+from ytranslate.fsloader import FSLoader
+from ytranslate.loader import Loader
+from ytranslate.tools import bind, select, t, t_many, using
+
+class TestTools(unittest.TestCase):
+
+    """Unittest for the functions of 'ytranslate.tools'.
+
+    The loader is created without loading any file:  its catalogs
+    are filled directly.
+
+    """
+
+    def setUp(self):
+        loader = FSLoader("unknown")
+        for name, title in (("en", "Ytranslator"), ("fr", "Ytraducteur")):
+            catalog = Catalog(name)
+            catalog.read_dictionary({"title": title, "ui": {"login": {
+                    "user": "{name} ({title})",
+                    "emails": {"1": "1 email", "2+": "{count} emails"}}}})
+            loader.catalogs[name] = catalog
+
+        Loader.current_loader = loader
+        Loader.current_catalog = None
+
+    def tearDown(self):
+        Loader.current_loader = None
+        Loader.current_catalog = None
+
+    def test_using(self):
+        """Test to select a catalog in the current context."""
+        select("en")
+        with using("fr"):
+            self.assertEqual(t("title"), "Ytraducteur")
+            with using("en"):
+                self.assertEqual(t("title"), "Ytranslator")
+            self.assertEqual(t("title"), "Ytraducteur")
+
+        self.assertEqual(t("title"), "Ytranslator")
+
+    def test_using_threads(self):
+        """Test that threads don't share their selected catalog."""
+        results = {}
+        barrier = threading.Barrier(2)
+
+        def translate(name):
+            with using(name):
+                barrier.wait()
+                results[name] = t("title")
+
+        threads = [threading.Thread(target=translate, args=(name, ))
+                for name in ("en", "fr")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {"en": "Ytranslator", "fr": "Ytraducteur"})
+        self.assertRaises(ValueError, t, "title")
+
+    def test_many(self):
+        """Test to retrieve several messages at once."""
+        select("en")
+        self.assertEqual(t_many(["title", ("ui.login.emails", 3),
+                ("ui.login.user", None, {"name": "Jean"})], title="admin"),
+                ["Ytranslator", "3 emails", "Jean (admin)"])
+
+    def test_bind(self):
+        """Test to retrieve messages in a bound namespace."""
+        select("en")
+        login = bind("ui.login")
+        self.assertEqual(login("emails", 1), "1 email")
+        with using("fr"):
+            self.assertEqual(login.retrieve_many([("user", None,
+                    {"name": "Jean", "title": "admin"})]), ["Jean (admin)"])
+
+        ui = bind("ui")
+        self.assertEqual(ui.bind("login").retrieve("emails", 2), "2 emails")
@@ -0,0 +1,70 @@
+﻿# Copyright (c) 2015, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Module containing the TreeTestCase class, described below."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+class TreeTestCase(unittest.TestCase):
+
+    """Base class of the tests using a temporary tree of catalog files.
+
+    A temporary directory is created for each test (see 'root_dir')
+    and removed afterward.  Paths are relative to this directory,
+    using '/' as a separator.
+
+    """
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def path(self, path):
+        """Return the full path of a catalog file."""
+        return os.path.join(self.root_dir, *path.split("/"))
+
+    def write(self, path, content):
+        """Write a catalog file, return its full path."""
+        fullname = self.path(path)
+        if not os.path.exists(os.path.dirname(fullname)):
+            os.makedirs(os.path.dirname(fullname))
+
+        with open(fullname, "w") as file:
+            file.write(content)
+
+        return fullname
+
+    def read(self, path):
+        """Read a catalog file."""
+        with open(self.path(path)) as file:
+            return file.read()
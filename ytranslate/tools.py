@@ -34,7 +34,8 @@ They can be called to interact with the created object of the
 """
 
 from ytranslate.fsloader import FSLoader
-from ytranslate.loader import Loader
+from ytranslate.loader import Loader, context_catalog
+from ytranslate.namespace import Namespace
 
 def init(LoaderClass=FSLoader, **kwargs):
     """Load the catalogs at a specified location.
@@ -48,11 +49,47 @@ def init(LoaderClass=FSLoader, **kwargs):
     For instance:
         init(root_dir="path/to/translations")
 
+    To only read the catalog files when they are needed, use
+    the 'lazy' argument:
+        init(root_dir="path/to/translations", lazy=True)
+
+    Compiled catalog files (see the 'compile' command) are used if
+    a cache directory is given:
+        init(root_dir="path/to/translations", cache_dir="path/to/cache")
+
+    The YAML backend can be selected ('c' if PyYAML has been built
+    with libyaml, or 'python').  By default, the 'c' backend is used
+    if available:
+        init(root_dir="path/to/translations", backend="python")
+
+    Catalog files can be parsed in parallel using an executor of
+    the 'concurrent.futures' module:
+        with ProcessPoolExecutor() as executor:
+            init(root_dir="path/to/translations", executor=executor)
+
+    Catalogs can fall back on other catalogs when a message is
+    missing:
+        init(root_dir="path/to/translations",
+                fallbacks={"fr-CA": ["fr", "en"]})
+
+    To reduce the memory used by many catalogs, they can be stored
+    in a compact, read-only form:
+        init(root_dir="path/to/translations", compact=True)
+
+    Large catalog files can be flattened while they are parsed,
+    to use less memory:
+        init(root_dir="path/to/translations", stream=True)
+
+    Other loaders can be used.  For instance, the StoreLoader
+    maps the catalog stores created by the 'compile' command
+    (with the '--store' option) in memory:
+        init(StoreLoader, store_dir="path/to/stores")
+
     Use the 'select' function to then select a catalog.
 
     """
     loader = LoaderClass(**kwargs)
-    FSLoader.current_loader = loader
+    Loader.current_loader = loader
     loader.load()
 
 def select(catalog):
@@ -66,8 +103,25 @@ def select(catalog):
         select("en")
 
     """
-    if FSLoader.current_loader:
-        FSLoader.current_loader.select(catalog)
+    if Loader.current_loader:
+        Loader.current_loader.select(catalog)
+    else:
+        raise ValueError("the current loader hasn't been selected")
+
+def using(catalog):
+    """Select the catalog in the current context only.
+
+    This context manager is useful in threaded or asynchronous
+    servers, to handle requests in different languages at the same
+    time.  The catalog is only selected in the current thread or
+    asyncio task, and the previous selection is restored when the
+    context manager exits.  For instance:
+        with using("fr"):
+            t("ui.title")
+
+    """
+    if Loader.current_loader:
+        return Loader.current_loader.using(catalog)
     else:
         raise ValueError("the current loader hasn't been selected")
 
@@ -94,7 +148,52 @@ def t(address, count=None, **kwargs):
     the syntax and corresponding catalogs.
 
     """
-    if FSLoader.current_catalog:
-        return FSLoader.current_catalog.retrieve(address, count, **kwargs)
+    catalog = context_catalog.get()
+    if catalog is None:
+        catalog = Loader.current_catalog
+
+    if catalog is not None:
+        return catalog.retrieve(address, count, **kwargs)
 
     raise ValueError("no catalog has been selected")
+
+def get_catalog():
+    """Return the catalog selected in the current context.
+
+    The catalog selected by 'using' has priority over the catalog
+    selected by 'select'.
+
+    """
+    catalog = context_catalog.get()
+    if catalog is None:
+        catalog = Loader.current_catalog
+
+    if catalog is None:
+        raise ValueError("no catalog has been selected")
+
+    return catalog
+
+def t_many(items, **kwargs):
+    """Retrieve several translated messages at once.
+
+    The items can be addresses, or tuples containing an address,
+    a count indicator and a dictionary of placeholders (the last
+    two being optional).  The placeholders specified as keyword
+    arguments are used for every message.  For instance:
+        title, emails = t_many(["ui.title", ("notification.emails", 3)])
+
+    """
+    return get_catalog().retrieve_many(items, **kwargs)
+
+def bind(namespace):
+    """Return a namespace bound to the selected catalog.
+
+    The namespace is prepended to the addresses, and the catalog
+    is resolved each time a message is retrieved, so that the
+    namespace can be created once.  For instance:
+        login = bind("ui.login")
+        login("user", name="Jean")
+        # Same as t("ui.login.user", name="Jean")
+
+    """
+    return Namespace(namespace, resolve=get_catalog)